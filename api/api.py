@@ -1,14 +1,30 @@
 #!flask/bin/python
-from flask import Flask, jsonify, abort, request, Response, make_response, url_for
+import json
+import os
+
+from flask import Flask, jsonify, abort, request, Response, make_response, url_for, stream_with_context
 from flask_restful import reqparse
-from bogglesolver.solve_boggle import SolveBoggle
-from bogglesolver.load_english_dictionary import Edict
+from bogglesolver.solve_boggle import SolveBoggle, SolveStats
+from bogglesolver.boggle_board import parse_board, format_board
+from bogglesolver.array_dictionary import ArrayEdict
+from bogglesolver.compiled_dictionary import MappedEdict
+from bogglesolver.solution_cache import SolutionCache
+from bogglesolver.adjacency import ADJACENCY
 # from flask.ext.api import FlaskAPI
 
 app = Flask(__name__, static_url_path = "")
 
-edict = Edict()
-edict.read_dictionary()
+# BOGGLE_DICTIONARY maps a compiled dictionary, shared between processes by the page cache.
+# Otherwise the flat arrays of an ArrayEdict stay shared with forked workers, where an Edict's nodes would be copied.
+if os.environ.get("BOGGLE_DICTIONARY"):
+    edict = MappedEdict(os.environ["BOGGLE_DICTIONARY"])
+else:
+    edict = ArrayEdict()
+    edict.read_dictionary()
+
+# BOGGLE_CACHE_PATH keeps solutions in a sqlite file as well as in memory.
+cache = SolutionCache(max_size=int(os.environ.get("BOGGLE_CACHE_SIZE", 1024)),
+                      path=os.environ.get("BOGGLE_CACHE_PATH"))
  
 
 @app.errorhandler(400)
@@ -23,7 +39,7 @@ def bad_request(error=None):
         "message": message,
         'errors': ["Bad Request"]
     }
-    return jsonify(message)
+    return jsonify(message), 400
 
 # @app.errorhandler(400)
 # def bad_request(error):
@@ -37,7 +53,17 @@ def not_found(error):
 def generate_board(rows, columns):
     solver = SolveBoggle()
     solver.set_board(columns, rows)
-    return ''.join(solver.boggle.boggle_array)
+    return format_board(solver.boggle.boggle_array)
+
+def read_board(rows, columns, board):
+    """Get the letters of a board from the url, faces of several letters are in brackets like [qu]."""
+    try:
+        board = parse_board(board)
+    except ValueError:
+        abort(400)
+    if len(board) != rows * columns:
+        abort(400)
+    return board
 
 def get_board_response(rows, columns):
     board = generate_board(rows, columns)
@@ -47,8 +73,8 @@ def get_board_response(rows, columns):
 @app.route("/")
 def play():
     rp = reqparse.RequestParser()
-    rp.add_argument("rows", default=4, type=int, required=True)
-    rp.add_argument("columns", default=4, type=int)
+    rp.add_argument("rows", default=4, type=int, required=True, location="args")
+    rp.add_argument("columns", default=4, type=int, location="args")
     req = rp.parse_args()
     return get_board_response(req["rows"], req["columns"])
 
@@ -58,10 +84,61 @@ def get_board(rows, columns):
 
 @app.route("/<int:rows>/<int:columns>/<board>", methods=['GET'])
 def solution(rows, columns, board):
+    board = read_board(rows, columns, board)
+    min_length = request.args.get("length", 3, type=int)
+    adjacency_funct = ADJACENCY.get(request.args.get("adjacency", "standard"))
+    if adjacency_funct is None:
+        abort(400)
+
+    paths = request.args.get("paths")
+    if paths not in (None, "0", "1", "all"):
+        abort(400)
+    stats = SolveStats() if request.args.get("stats", 0, type=int) else None
+
+    def new_solver():
+        solver = SolveBoggle()
+        solver.min_word_len = min_length
+        solver.set_board(columns, rows, board)
+        return solver
+
+    def solve():
+        return new_solver().solve(edict, adjacency_funct=adjacency_funct, stats=stats)
+
+    if paths in ("1", "all"):
+        # cached solutions are just the words, so solve it again.
+        word_paths = new_solver().solve_paths(edict, adjacency_funct=adjacency_funct, all_paths=paths == "all")
+        if paths == "all":
+            word_paths = dict((word, [path.tolist() for path in all_paths]) for word, all_paths in word_paths.items())
+        else:
+            word_paths = dict((word, path.tolist()) for word, path in word_paths.items())
+        return jsonify(dict(words=sorted(word_paths), paths=word_paths))
+    if stats is not None:
+        # a cached solution has no stats, so solve it again.
+        return jsonify(dict(words=solve(), stats=stats.to_dict()))
+    key = cache.make_key(rows, columns, board, min_length, adjacency_funct)
+    words = cache.get_or_solve(key, solve)
+    return jsonify(dict(words=words))
+
+@app.route("/<int:rows>/<int:columns>/<board>/stream", methods=['GET'])
+def stream_solution(rows, columns, board):
+    """Stream the words as newline delimited JSON, one object per word as it is found."""
+    board = read_board(rows, columns, board)
+    adjacency_funct = ADJACENCY.get(request.args.get("adjacency", "standard"))
+    if adjacency_funct is None:
+        abort(400)
     solver = SolveBoggle()
+    solver.min_word_len = request.args.get("length", 3, type=int)
     solver.set_board(columns, rows, board)
-    words = solver.solve(edict)
-    return jsonify(dict(words=words))
+
+    def generate():
+        for word in solver.iter_words(edict, adjacency_funct=adjacency_funct):
+            yield json.dumps(dict(word=word)) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/cache", methods=['GET'])
+def cache_stats():
+    return jsonify(cache.stats())
 
 @app.before_request
 def log_request():
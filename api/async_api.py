@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""Asyncio version of the solver API, as a plain ASGI application.
+
+Serves the same routes as api.py, run it with any ASGI server:
+    uvicorn api.async_api:app
+
+Board generation and cached solutions are answered on the event loop.
+Solving is sent to a bounded process pool, so a slow board never blocks other requests.
+A solve that times out keeps its place in the pool until its process finishes it,
+so slow boards get 503s instead of piling up behind each other.
+Limits are read from the environment:
+    BOGGLE_WORKERS: solver processes (default: one per cpu).
+    BOGGLE_MAX_PENDING: solves running or waiting before new ones get a 503 (default: 4 per worker).
+    BOGGLE_TIMEOUT: seconds to wait for a solve before answering 504 (default: 10).
+    BOGGLE_MAX_CELLS: biggest board, in cells, that will be generated or solved (default: 2500).
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs
+
+from bogglesolver.solve_boggle import SolveBoggle, get_pool_context
+from bogglesolver.boggle_board import parse_board, format_board
+from bogglesolver.load_english_dictionary import Edict
+from bogglesolver.solution_cache import SolutionCache
+from bogglesolver.adjacency import ADJACENCY
+
+WORKERS = int(os.environ.get("BOGGLE_WORKERS", os.cpu_count() or 1))
+MAX_PENDING = int(os.environ.get("BOGGLE_MAX_PENDING", WORKERS * 4))
+TIMEOUT = float(os.environ.get("BOGGLE_TIMEOUT", 10))
+MAX_CELLS = int(os.environ.get("BOGGLE_MAX_CELLS", 2500))
+
+# built before the pool forks, so every solver process shares it.
+edict = Edict()
+edict.read_dictionary()
+
+cache = SolutionCache(max_size=int(os.environ.get("BOGGLE_CACHE_SIZE", 1024)),
+                      path=os.environ.get("BOGGLE_CACHE_PATH"))
+
+_pool = None
+# solves sent to the pool that haven't finished, counted down from the pool's thread.
+_pending = 0
+_pending_lock = threading.Lock()
+
+BOARD_ROUTE = re.compile(r"^/(\d+)/(\d+)/?$")
+SOLUTION_ROUTE = re.compile(r"^/(\d+)/(\d+)/([^/]+)/?$")
+
+
+def solve_board(rows, columns, board, min_length, adjacency, paths=None):
+    """
+    Solve a board, run in the solver processes.
+
+    :param paths: "1" for the first path of each word, "all" for all of them (optional).
+    :returns: list of words, or with paths a dict of word: list of paths.
+    """
+    solver = SolveBoggle()
+    solver.min_word_len = min_length
+    solver.set_board(columns, rows, board)
+    if paths == "all":
+        return dict((word, [path.tolist() for path in all_paths]) for word, all_paths in
+                    solver.solve_paths(edict, adjacency_funct=ADJACENCY[adjacency], all_paths=True).items())
+    if paths == "1":
+        return dict((word, path.tolist()) for word, path in
+                    solver.solve_paths(edict, adjacency_funct=ADJACENCY[adjacency]).items())
+    return solver.solve(edict, adjacency_funct=ADJACENCY[adjacency])
+
+
+def generate_board(rows, columns):
+    solver = SolveBoggle()
+    solver.set_board(columns, rows)
+    return format_board(solver.boggle.boggle_array)
+
+
+def get_board_response(rows, columns):
+    if rows * columns > MAX_CELLS:
+        return 400, dict(status=400, message="Boards are limited to %s cells." % MAX_CELLS)
+    board = generate_board(rows, columns)
+    return 200, dict(board=board, solution="/%s/%s/%s" % (rows, columns, board))
+
+
+def _solve_finished(future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+async def get_solution_response(rows, columns, board, query):
+    global _pool, _pending
+    try:
+        board = parse_board(board)
+    except ValueError as error:
+        return 400, dict(status=400, message=str(error))
+    if len(board) != rows * columns:
+        return 400, dict(status=400, message="Board does not have %s letters." % (rows * columns))
+    if rows * columns > MAX_CELLS:
+        return 400, dict(status=400, message="Boards are limited to %s cells." % MAX_CELLS)
+    try:
+        min_length = int(query.get("length", ["3"])[0])
+    except ValueError:
+        return 400, dict(status=400, message="length must be an integer.")
+    adjacency = query.get("adjacency", ["standard"])[0]
+    if adjacency not in ADJACENCY:
+        return 400, dict(status=400, message="adjacency must be one of %s." % ", ".join(sorted(ADJACENCY)))
+
+    paths = query.get("paths", ["0"])[0]
+    if paths not in ("0", "1", "all"):
+        return 400, dict(status=400, message="paths must be 0, 1 or all.")
+    if paths == "0":
+        paths = None
+
+    # cached solutions are just the words, so boards with paths are always solved.
+    key = cache.make_key(rows, columns, board, min_length, ADJACENCY[adjacency])
+    words = cache.get(key) if paths is None else None
+    if words is not None:
+        return 200, dict(words=words)
+
+    if _pool is None:
+        _pool = ProcessPoolExecutor(WORKERS, mp_context=get_pool_context())
+    with _pending_lock:
+        if _pending >= MAX_PENDING:
+            return 503, dict(status=503, message="Too many boards are being solved, try again later.")
+        _pending += 1
+    try:
+        future = _pool.submit(solve_board, rows, columns, board, min_length, adjacency, paths)
+    except Exception:
+        _solve_finished(None)
+        raise
+    # the place is given back when the solve is done, not when the request stops waiting for it.
+    future.add_done_callback(_solve_finished)
+    try:
+        words = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), TIMEOUT)
+    except asyncio.TimeoutError:
+        # only a solve still waiting for a process can be cancelled, a running one is left to finish.
+        future.cancel()
+        return 504, dict(status=504, message="Solving took longer than %s seconds." % TIMEOUT)
+    if paths is not None:
+        return 200, dict(words=sorted(words), paths=words)
+    cache.put(key, words)
+    return 200, dict(words=words)
+
+
+async def route(path, query):
+    if path == "/":
+        try:
+            rows = int(query.get("rows", ["4"])[0])
+            columns = int(query.get("columns", ["4"])[0])
+        except ValueError:
+            return 400, dict(status=400, message="rows and columns must be integers.")
+        return get_board_response(rows, columns)
+    if path.rstrip("/") == "/cache":
+        return 200, cache.stats()
+    match = BOARD_ROUTE.match(path)
+    if match:
+        return get_board_response(int(match.group(1)), int(match.group(2)))
+    match = SOLUTION_ROUTE.match(path)
+    if match:
+        return await get_solution_response(int(match.group(1)), int(match.group(2)), match.group(3), query)
+    return 404, dict(error="Not found")
+
+
+async def send_json(send, status, body):
+    data = json.dumps(body).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(data)).encode("ascii"))]})
+    await send({"type": "http.response.body", "body": data})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if _pool is not None:
+                    _pool.shutdown(wait=False, cancel_futures=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    if scope["method"] not in ("GET", "HEAD"):
+        await send_json(send, 405, dict(error="Method not allowed"))
+        return
+    query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+    status, body = await route(scope["path"], query)
+    await send_json(send, status, body)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app)
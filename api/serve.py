@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Serve api.py from several worker processes that share one dictionary.
+
+The dictionary is built once in this process, then the workers are forked,
+so they share its memory copy-on-write instead of each building their own.
+api.py builds an ArrayEdict, a few flat arrays, so solving only reads those pages.
+An Edict would not stay shared: every node is an object whose reference count
+is written as it is walked, which copies its page into the worker.
+Each worker reports its memory at startup, and again after warming up with
+a few solves, so the private part shows what serving actually copied.
+
+    python -m api.serve --workers 4 --port 5000
+
+Setting BOGGLE_DICTIONARY to a compiled dictionary file (see bogglesolver.compiled_dictionary)
+makes api.py memory map it instead, so it is shared through the page cache as well.
+
+Each worker has its own in-memory solution cache, so /cache reports the worker that answered it.
+Only the BOGGLE_CACHE_PATH sqlite file is shared, each worker opens it for itself.
+A worker that dies is replaced with a new fork; SIGTERM or SIGINT stops them all.
+"""
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+
+
+def memory_usage(pid="self"):
+    """
+    Get the memory used by a process, in kB.
+
+    Uses /proc/<pid>/smaps_rollup where it exists, so shared pages are reported separately.
+    Elsewhere only the peak resident size is known.
+
+    :returns: dict of the sizes that could be read.
+    """
+    usage = {}
+    try:
+        with open("/proc/%s/smaps_rollup" % pid) as smaps:
+            for line in smaps:
+                fields = line.split()
+                if fields[0] in ("Rss:", "Pss:", "Shared_Clean:", "Shared_Dirty:",
+                                 "Private_Clean:", "Private_Dirty:"):
+                    usage[fields[0].rstrip(":").lower()] = int(fields[1])
+    except (IOError, OSError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # linux reports kB, macOS bytes.
+        usage["max_rss"] = peak // 1024 if sys.platform == "darwin" else peak
+    if "shared_clean" in usage:
+        usage["shared"] = usage.pop("shared_clean") + usage.pop("shared_dirty")
+        usage["private"] = usage.pop("private_clean") + usage.pop("private_dirty")
+    return usage
+
+
+def format_memory(usage):
+    return ", ".join("%s: %.1f MB" % (name, size / 1024.0) for name, size in sorted(usage.items()))
+
+
+def log(message):
+    # one write per line, so lines from different workers don't run into each other.
+    sys.stdout.write(message + "\n")
+    sys.stdout.flush()
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        sys.stderr.write("[%s] %s\n" % (os.getpid(), format % args))
+
+
+def run_worker(server, warmup=None):
+    # the supervisor's signal handlers are for the supervisor.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    log("Worker %s started. %s" % (os.getpid(), format_memory(memory_usage())))
+    if warmup is not None:
+        warmup()
+        log("Worker %s warmed up. %s" % (os.getpid(), format_memory(memory_usage())))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    os._exit(0)
+
+
+def start_worker(server, warmup=None):
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid == 0:
+        run_worker(server, warmup)
+    return pid
+
+
+def warm_up_solver(edict, count=20, size=10):
+    """
+    Get a warmup for serve that solves boards like a worker would.
+
+    :param edict: dictionary the app solves with.
+    :param int count: number of boards to solve.
+    :param int size: number of rows and columns of the boards.
+    :returns: function taking no arguments.
+    """
+    from bogglesolver.bench import seeded_boards
+    from bogglesolver.solve_boggle import SolveBoggle
+
+    def warmup():
+        solver = SolveBoggle()
+        for board in seeded_boards(size, count):
+            solver.set_board(size, size, board)
+            solver.solve(edict)
+    return warmup
+
+
+def serve(app, host="127.0.0.1", port=5000, workers=1, warmup=None):
+    """
+    Serve a WSGI app from forked workers, until SIGTERM or SIGINT.
+
+    :param app: WSGI app, already loaded so the workers share it.
+    :param int port: port to listen on, 0 for any free port.
+    :param int workers: number of worker processes, dead ones are replaced.
+    :param warmup: function each worker calls before serving, its memory is reported after (optional).
+    """
+    # keep the garbage collector from touching, and so copying, the loaded app in every worker.
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    log("App loaded in %s. %s" % (os.getpid(), format_memory(memory_usage())))
+
+    server = make_server(host, port, app, handler_class=QuietHandler)
+    children = dict((start_worker(server, warmup), time.time()) for i in range(workers))
+    log("Serving on http://%s:%s with %s workers." % (host, server.server_port, workers))
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for child in list(children):
+            try:
+                os.kill(child, signal.SIGTERM)
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        log("Worker %s exited with status %s, starting another." % (pid, status))
+        # a worker that can't stay up shouldn't be restarted as fast as it dies.
+        if time.time() - started < 1:
+            time.sleep(1)
+        if not stopping:
+            children[start_worker(server, warmup)] = time.time()
+    server.server_close()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Serve the boggle API from preforked workers.")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="Number of 10x10 boards each worker solves before reporting its memory again, 0 for none.")
+    args = parser.parse_args(args=args)
+
+    # building the dictionary happens on import.
+    from api.api import app, edict
+    warmup = warm_up_solver(edict, args.warmup) if args.warmup else None
+    serve(app, args.host, args.port, args.workers, warmup)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
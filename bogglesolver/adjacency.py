@@ -8,9 +8,19 @@ WARNING: the adjacency function will be called a lot. optimize it for speed if y
 The examples are optimized for speed.
 If you find faster ways to do this please share.
 If you have speed issues using your own function, optimize it for speed.
+
+The solver doesn't call the adjacency function while searching.
+get_neighbor_table calls it once per index and caches the results
+for each board size, so the search only walks precomputed tuples.
+Other board shapes can be declared as a Topology (see topology.py) instead of written as a function.
 """
 
 
+from functools import lru_cache
+
+from bogglesolver.topology import CYLINDER, HEX, KNIGHT
+
+
 def get_standard_boggle_adjacent(index, num_columns, num_rows, ignore=None):
     """
     Get all adjacent indexes for a standard boggle board.
@@ -151,6 +161,7 @@ def get_scrabble_adjacent(index, num_columns, num_rows, ignore=None):
 
     WARNING: this does not scale to larger boards as well as the other two
         as it has to return a lot more indeces.
+        SolveBoggle.solve_rack finds the same words without trying every ordering.
 
     Basically if it's not the index, and not ignored, yield it.
 
@@ -165,3 +176,76 @@ def get_scrabble_adjacent(index, num_columns, num_rows, ignore=None):
     for i in range(0, num_rows * num_columns):
         if i not in ignore and i is not index:
             yield i
+
+
+@lru_cache(maxsize=32)
+def get_neighbor_table(adjacency_funct, num_columns, num_rows):
+    """
+    Get the adjacent indexes of every index on a board.
+
+    Tables are cached by adjacency function and board size,
+        so they are only built once per board geometry.
+    An adjacency_funct with a neighbor_table method, like a Topology, builds the table itself.
+
+    :param adjacency_funct: adjacency function to build the table from.
+    :param int num_columns: number of columns in the board.
+    :param int num_rows: number of rows in the board.
+    :returns: tuple where item i is a tuple of the indexes adjacent to index i.
+    """
+    if hasattr(adjacency_funct, 'neighbor_table'):
+        return adjacency_funct.neighbor_table(num_columns, num_rows)
+    table = []
+    for index in range(0, num_columns * num_rows):
+        adjacent = []
+        # small boards can wrap back onto the same index more than once.
+        for adjacent_index in adjacency_funct(index, num_columns, num_rows, [index]):
+            if adjacent_index not in adjacent:
+                adjacent.append(adjacent_index)
+        table.append(tuple(adjacent))
+    return tuple(table)
+
+
+def get_holes(adjacency_funct):
+    """
+    Get the indexes no word can use, like the holes of a Topology.
+
+    :param adjacency_funct: adjacency function the board is solved with.
+    :returns: frozenset of indexes, empty for the adjacency functions.
+    """
+    return getattr(adjacency_funct, 'holes', frozenset())
+
+
+# the adjacency functions by the names the command line tools and the API take.
+ADJACENCY = {
+    "standard": get_standard_boggle_adjacent,
+    "toroid": get_toroid_boggle_adjacent,
+    "scrabble": get_scrabble_adjacent,
+    "cylinder": CYLINDER,
+    "hex": HEX,
+    "knight": KNIGHT,
+}
+
+
+def adjacency_key(adjacency_funct):
+    """
+    Get a name for an adjacency function that is the same in every process, for cache keys.
+
+    Functions are named by their module and qualified name,
+        so two functions with the same name in different places get different keys.
+    An object with a key attribute, like a Topology, is named by that.
+
+    :param adjacency_funct: adjacency function to name.
+    :returns: str key.
+    :raises ValueError: for lambdas and functions defined inside other functions, which have no lasting name.
+    """
+    key = getattr(adjacency_funct, 'key', None)
+    if key is not None:
+        return key
+    qualname = getattr(adjacency_funct, '__qualname__', None)
+    if qualname is None:
+        # other callable objects name themselves.
+        return adjacency_funct.__name__
+    if '<' in qualname:
+        raise ValueError("%r has no name that is the same in every process, define it at module level." %
+                         adjacency_funct)
+    return "%s.%s" % (adjacency_funct.__module__, qualname)
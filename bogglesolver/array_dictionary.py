@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+
+"""Stores the dictionary in flat arrays instead of linked nodes.
+
+Every _dictnode in an Edict is a python object with its own dict,
+so the full word list costs hundreds of MB.
+Here the trie is kept in four columns:
+
+    edge_start: for each node, the index of its first edge (plus one end entry).
+    targets: for each edge, the node it leads to.
+    terminal: for each node, 1 if a word ends there.
+    letters: for each edge, the letter it is labelled with.
+
+Nodes are integers and node 0 is the root.
+The edges of a node are contiguous and sorted by letter,
+so finding the next node is a single bytes.find on the letters column.
+
+Built with minimize=True the columns hold a DAWG instead of a trie,
+where nodes with identical endings ("-ing", "-ers", ...) are shared.
+A node then no longer identifies a single word,
+so words are always recovered from the letters along the path.
+"""
+
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+
+# single byte strings for every letter, so lookups don't encode on every step.
+_CHAR_BYTES = dict((chr(i), bytes(bytearray([i]))) for i in range(128))
+
+
+def build_columns(words):
+    """
+    Build the flat trie columns for a list of words.
+
+    Nodes are numbered breadth first, so node 0 is the root.
+
+    :param list words: words to put in the trie.
+    :returns: tuple of (edge_start, targets, terminal, letters).
+    """
+    words = sorted(set(word.lower() for word in words if word))
+    for word in words:
+        if any(l not in _CHAR_BYTES for l in word):
+            raise ValueError("Only ascii words can be stored: %r" % word)
+
+    edge_start = array('I', [0])
+    targets = array('I')
+    terminal = bytearray()
+    letters = bytearray()
+
+    # each queued entry is the range of words below a node, and the depth of that node.
+    queue = deque([(0, len(words), 0)])
+    next_node = 1
+    while queue:
+        low, high, depth = queue.popleft()
+        # sorted order puts a word before every longer word sharing its prefix.
+        if low < high and len(words[low]) == depth:
+            terminal.append(1)
+            low += 1
+        else:
+            terminal.append(0)
+        while low < high:
+            prefix = words[low][:depth + 1]
+            end = bisect_left(words, prefix[:-1] + chr(ord(prefix[-1]) + 1), low, high)
+            letters.append(ord(prefix[-1]))
+            targets.append(next_node)
+            next_node += 1
+            queue.append((low, end, depth + 1))
+            low = end
+        edge_start.append(len(targets))
+    return edge_start, targets, terminal, letters
+
+
+class _DawgState:
+
+    """A node of the DAWG while it is being built."""
+
+    __slots__ = ('terminal', 'edges', 'number')
+
+    def __init__(self):
+        self.terminal = False
+        self.edges = []
+        self.number = None
+
+    def key(self):
+        """Everything that makes two states interchangeable."""
+        return (self.terminal, tuple((letter, state.number) for letter, state in self.edges))
+
+
+def build_dawg_columns(words):
+    """
+    Build the flat columns for a minimized DAWG of a list of words.
+
+    Uses incremental minimization on sorted input,
+        so only the path of the previous word is ever unminimized.
+    Nodes are numbered breadth first, so node 0 is the root.
+
+    :param list words: words to put in the DAWG.
+    :returns: tuple of (edge_start, targets, terminal, letters).
+    """
+    words = sorted(set(word.lower() for word in words if word))
+    for word in words:
+        if any(l not in _CHAR_BYTES for l in word):
+            raise ValueError("Only ascii words can be stored: %r" % word)
+
+    register = {}
+
+    def minimize(path, previous, down_to):
+        # replace each state on the previous path with an equal registered state, deepest first.
+        for depth in range(len(path) - 1, down_to, -1):
+            state = path[depth]
+            canonical = register.setdefault(state.key(), state)
+            if canonical is state:
+                state.number = len(register)
+            else:
+                path[depth - 1].edges[-1] = (previous[depth - 1], canonical)
+        del path[down_to + 1:]
+
+    root = _DawgState()
+    path = [root]
+    previous = ""
+    for word in words:
+        common = 0
+        while common < len(previous) and common < len(word) and previous[common] == word[common]:
+            common += 1
+        minimize(path, previous, common)
+        for letter in word[common:]:
+            state = _DawgState()
+            path[-1].edges.append((letter, state))
+            path.append(state)
+        path[-1].terminal = True
+        previous = word
+    minimize(path, previous, 0)
+
+    edge_start = array('I', [0])
+    targets = array('I')
+    terminal = bytearray()
+    letters = bytearray()
+
+    # renumber breadth first, the register numbers were only needed for the keys.
+    node_numbers = {root: 0}
+    queue = deque([root])
+    while queue:
+        state = queue.popleft()
+        terminal.append(1 if state.terminal else 0)
+        for letter, child in state.edges:
+            if child not in node_numbers:
+                node_numbers[child] = len(node_numbers)
+                queue.append(child)
+            letters.append(ord(letter))
+            targets.append(node_numbers[child])
+        edge_start.append(len(targets))
+    return edge_start, targets, terminal, letters
+
+
+class _ColumnEdict:
+
+    """
+    Walks a trie stored in flat columns.
+
+    Subclasses set the columns, where the letters column is searched with find
+    starting at _letter_base.
+    """
+
+    dictionary_root = 0
+
+    def _set_columns(self, edge_start, targets, terminal, letters, letter_base=0):
+        self._edge_start = edge_start
+        self._targets = targets
+        self._terminal = terminal
+        self._letters = letters
+        self._letter_base = letter_base
+
+    @property
+    def node_count(self):
+        """The number of nodes in the dictionary."""
+        return len(self._terminal)
+
+    def is_terminal(self, node):
+        """
+        Determine if a word ends at the node.
+
+        :param int node: node in the dictionary.
+        :returns: True if a word ends at the node.
+        """
+        return self._terminal[node] == 1
+
+    def has_children(self, node):
+        """
+        Determine if any words continue past the node.
+
+        :param int node: node in the dictionary.
+        :returns: True if the node has at least one child.
+        """
+        return self._edge_start[node] != self._edge_start[node + 1]
+
+    def iter_children(self, node):
+        """
+        Get every letter that continues past the node.
+
+        :param int node: node in the dictionary.
+        :returns: iterator of (letter, child node) tuples.
+        """
+        start = self._edge_start[node]
+        end = self._edge_start[node + 1]
+        letters = self._letters[self._letter_base + start:self._letter_base + end]
+        return zip(map(chr, letters), self._targets[start:end])
+
+    def get_last_node(self, node, letter):
+        """
+        Follow the letters provided from the provided node.
+
+        :param int node: node in the dictionary.
+        :param str letter: next letter, or letters.
+        :returns: the node reached, or None if there is no such path.
+        """
+        for l in letter:
+            start = self._edge_start[node]
+            end = self._edge_start[node + 1]
+            if start == end or l not in _CHAR_BYTES:
+                return None
+            position = self._letters.find(_CHAR_BYTES[l], self._letter_base + start, self._letter_base + end)
+            if position < 0:
+                return None
+            node = self._targets[position - self._letter_base]
+        return node
+
+    def is_word(self, word):
+        """
+        Determine if a word is in the dictionary.
+
+        :param str word: word to look for in the dictionary.
+        :returns: True if word is in dictionary. Otherwise False.
+        """
+        node = self.get_last_node(self.dictionary_root, word.lower())
+        return node is not None and self.is_terminal(node)
+
+    def max_word_length(self):
+        """
+        Get the length of the longest word in the dictionary.
+
+        :returns: int length, 0 if the dictionary is empty.
+        """
+        # longest path below each node, filled in once all of a node's children are.
+        heights = array('i', [-1]) * self.node_count
+        stack = [self.dictionary_root]
+        while stack:
+            node = stack[-1]
+            if heights[node] >= 0:
+                stack.pop()
+                continue
+            children = self._targets[self._edge_start[node]:self._edge_start[node + 1]]
+            pending = [child for child in children if heights[child] < 0]
+            if pending:
+                stack.extend(pending)
+            else:
+                heights[node] = max([heights[child] + 1 for child in children] or [0])
+                stack.pop()
+        return heights[self.dictionary_root]
+
+    def get_words(self, node, all_words=None, prefix=""):
+        """
+        Get all words from the specified node on down.
+
+        If called with the root node passed in,
+            returns all words in the dictionary.
+        Called like Edict.get_words, the words are added to all_words.
+        Nodes don't keep the letters spelled to reach them, so pass prefix for a node below the root.
+
+        :param int node: node to get all words from.
+        :param list all_words: list of all words found so far (optional).
+        :param str prefix: the letters spelled to reach the node.
+        :returns: all_words with the words from the node on down added, in sorted order, each once.
+        """
+        if all_words is None:
+            all_words = []
+        found = set(all_words)
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if self.is_terminal(node) and prefix not in found:
+                all_words.append(prefix)
+            start = self._edge_start[node]
+            # push in reverse so the smallest letter is searched first.
+            for edge in range(self._edge_start[node + 1] - 1, start - 1, -1):
+                letter = chr(self._letters[self._letter_base + edge])
+                stack.append((self._targets[edge], prefix + letter))
+        return all_words
+
+
+class ArrayEdict(_ColumnEdict):
+
+    """
+    A dictionary stored in flat arrays.
+
+    Has the same interface as an Edict, but uses an order of magnitude less memory.
+    Adding words rebuilds the arrays, so add words in bulk with add_words.
+
+    :param list words: words to start with (optional).
+    :param bool minimize: store a DAWG instead of a trie.
+    """
+
+    def __init__(self, words=None, minimize=False):
+        self.minimize = minimize
+        # counts changes to the words, so anything cached from the dictionary can tell it is out of date.
+        self.generation = 0
+        self._set_columns(*self._build(words or []))
+
+    def _build(self, words):
+        if self.minimize:
+            return build_dawg_columns(words)
+        return build_columns(words)
+
+    def _set_columns(self, edge_start, targets, terminal, letters, letter_base=0):
+        _ColumnEdict._set_columns(self, edge_start, targets, bytes(terminal), bytes(letters), letter_base)
+
+    def read_dictionary(self, use_test_words=False):
+        """
+        Read in the list of valid words and add them to the dictionary.
+
+        :param bool use_test_words: whether to use
+            the test words or actual words.
+        """
+        from bogglesolver import twl06
+        self.add_words(twl06.TEST_WORD_LIST if use_test_words else twl06.WORD_LIST)
+
+    def add_words(self, words):
+        """
+        Add several words to the dictionary, rebuilding the arrays once.
+
+        :param list words: words to add.
+        """
+        all_words = self.get_words(self.dictionary_root)
+        all_words.extend(words)
+        self._set_columns(*self._build(all_words))
+        self.generation += 1
+
+    def add_word(self, word):
+        """
+        Add a word to the dictionary.
+
+        This is for extending the dictionary.
+
+        :param str word: word to add.
+        """
+        self.add_words([word])
+
+    def save(self, path):
+        """
+        Write the dictionary to a file that MappedEdict can open.
+
+        :param str path: file to write.
+        """
+        from bogglesolver.compiled_dictionary import write_columns
+        write_columns(path, self._edge_start, self._targets, self._terminal, self._letters)
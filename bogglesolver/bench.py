@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+"""Benchmark the solver on a fixed set of seeded boards.
+
+Measures how long the dictionary takes to load, solve latency percentiles
+and boards per second for each board size and adjacency function,
+and the peak memory of the whole run.
+Results are written as JSON, and can be compared against a saved baseline:
+
+    python -m bogglesolver.bench --output baseline.json
+    python -m bogglesolver.bench --baseline baseline.json
+
+Exits with 1 if any median solve time is slower than the baseline by more than the threshold,
+and with 2 if the baseline was run with a different dictionary engine, word list or search.
+"""
+
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from bogglesolver.adjacency import ADJACENCY
+from bogglesolver.boggle_board import Boggle
+from bogglesolver.load_english_dictionary import DICTIONARIES, load_dictionary
+from bogglesolver.solve_boggle import SolveBoggle
+
+
+# board size: number of boards solved at that size.
+DEFAULT_BOARDS = {4: 100, 5: 50, 10: 10, 50: 2, 100: 1}
+# scrabble adjacency tries every ordering of the letters, 5x5 already takes many seconds.
+SCRABBLE_MAX_SIZE = 4
+
+
+def seeded_boards(size, count):
+    """
+    Get the same boards every time for a board size.
+
+    :param int size: number of rows and columns.
+    :param int count: number of boards.
+    :returns: list of boggle arrays.
+    """
+    board = Boggle(size, size)
+    boards = []
+    for i in range(count):
+        board.generate_boggle_board(seed=size * 100003 + i)
+        boards.append(board.boggle_array)
+    return boards
+
+
+def percentile(values, fraction):
+    """
+    Get a percentile of some values, interpolating between the closest two.
+
+    :param list values: values to get the percentile of.
+    :param float fraction: percentile as a fraction, 0.5 for the median.
+    :returns: the percentile.
+    """
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def peak_memory_kb():
+    """Get the peak resident memory of this process in kB, or None if it can't be measured."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kB, macOS bytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def bench_solve(edict, size, adjacency, boards):
+    """
+    Time solving boards of one size.
+
+    :returns: dict of the latency percentiles, boards per second and words found.
+    """
+    solver = SolveBoggle()
+    times = []
+    words = 0
+    for board in boards:
+        solver.set_board(size, size, board)
+        start = time.perf_counter()
+        words += len(solver.solve(edict, adjacency_funct=ADJACENCY[adjacency]))
+        times.append(time.perf_counter() - start)
+    return dict(size=size, adjacency=adjacency, boards=len(boards), words=words,
+                p50=percentile(times, 0.5), p90=percentile(times, 0.9), p99=percentile(times, 0.99),
+                max=max(times), boards_per_second=len(boards) / sum(times) if sum(times) else 0.0)
+
+
+def run(sizes=None, adjacencies=None, boards=None, dictionary="edict", use_test_words=False, report=None):
+    """
+    Run the benchmark.
+
+    :param list sizes: board sizes to solve, defaults to every size in DEFAULT_BOARDS.
+    :param list adjacencies: names from ADJACENCY, defaults to all of them.
+    :param int boards: boards per size, defaults to DEFAULT_BOARDS.
+    :param str dictionary: dictionary engine, one of DICTIONARIES.
+    :param bool use_test_words: use the test words, for checking the benchmark itself.
+    :param report: called with each result as it is measured (optional).
+    :returns: dict of results that can be saved as JSON.
+    """
+    sizes = sizes or sorted(DEFAULT_BOARDS)
+    adjacencies = adjacencies or sorted(ADJACENCY)
+
+    memory_before = peak_memory_kb()
+    start = time.perf_counter()
+    edict = load_dictionary(dictionary, use_test_words)
+    load_seconds = time.perf_counter() - start
+    memory_after = peak_memory_kb()
+
+    results = []
+    for size in sizes:
+        size_boards = seeded_boards(size, boards or DEFAULT_BOARDS.get(size, 1))
+        for adjacency in adjacencies:
+            if adjacency == "scrabble" and size > SCRABBLE_MAX_SIZE:
+                continue
+            result = bench_solve(edict, size, adjacency, size_boards)
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        dictionary=dict(engine=dictionary, test_words=use_test_words, load_seconds=load_seconds,
+                        memory_kb=memory_after - memory_before if memory_before is not None else None),
+        peak_memory_kb=peak_memory_kb(),
+        results=results,
+    )
+
+
+def configuration(results):
+    """
+    Get what a run measured, other than the board sizes and adjacency functions.
+
+    :param dict results: results from run.
+    :returns: dict of the dictionary engine and whether it used the test words.
+    """
+    return dict(dictionary=results["dictionary"]["engine"], test_words=results["dictionary"]["test_words"])
+
+
+def format_configuration(results):
+    """Get the configuration of a run as text, for messages."""
+    return ", ".join("%s=%s" % item for item in sorted(configuration(results).items()))
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Find solves that got slower than the baseline.
+
+    :param dict results: results from run.
+    :param dict baseline: earlier results from run.
+    :param float threshold: allowed slowdown, as a fraction of the baseline.
+    :returns: list of messages, one per regression.
+    :raises ValueError: if the runs used a different dictionary engine or word list.
+    """
+    if configuration(results) != configuration(baseline):
+        raise ValueError("Can't compare a run with %s to a baseline with %s." % (
+            format_configuration(results), format_configuration(baseline)))
+    old = dict(((result["size"], result["adjacency"]), result) for result in baseline["results"])
+    regressions = []
+    for result in results["results"]:
+        before = old.get((result["size"], result["adjacency"]))
+        if before is None or not before["p50"]:
+            continue
+        change = result["p50"] / before["p50"] - 1
+        if change > threshold:
+            regressions.append("%sx%s %s: median %.4fs is %.0f%% slower than %.4fs." % (
+                result["size"], result["size"], result["adjacency"], result["p50"], change * 100, before["p50"]))
+    return regressions
+
+
+def format_result(result):
+    """Get one result as a line of text."""
+    return "%3sx%-3s %-8s %4s boards  p50 %.4fs  p90 %.4fs  p99 %.4fs  max %.4fs  %8.1f boards/sec" % (
+        result["size"], result["size"], result["adjacency"], result["boards"], result["p50"], result["p90"],
+        result["p99"], result["max"], result["boards_per_second"])
+
+
+def main(args=None):
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the boggle solver on seeded boards.")
+    parser.add_argument('-s', '--sizes', type=int, nargs='+',
+                        help="Board sizes to solve. Defaults to %s." % " ".join(map(str, sorted(DEFAULT_BOARDS))))
+    parser.add_argument('-a', '--adjacency', nargs='+', choices=sorted(ADJACENCY),
+                        help="Adjacency functions to solve with. Defaults to all.")
+    parser.add_argument('-n', '--boards', type=int,
+                        help="Boards to solve for each size.")
+    parser.add_argument('-d', '--dictionary', choices=DICTIONARIES, default="edict",
+                        help="Dictionary engine to solve with.")
+    parser.add_argument('-t', '--test-words', action='store_true',
+                        help="Use the test words instead of the twl06 word list.")
+    parser.add_argument('-o', '--output', type=str,
+                        help="Write the results as JSON to this file.")
+    parser.add_argument('-b', '--baseline', type=str,
+                        help="Compare against results saved with --output.")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed median slowdown against the baseline, as a fraction.")
+    args = parser.parse_args(args=args)
+
+    results = run(args.sizes, args.adjacency, args.boards, args.dictionary, args.test_words,
+                  report=lambda result: print(format_result(result)))
+    print("Dictionary %s loaded in %.3fs. Peak memory %s kB." % (
+        args.dictionary, results["dictionary"]["load_seconds"], results["peak_memory_kb"]))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        try:
+            regressions = compare(results, baseline, args.threshold)
+        except ValueError as error:
+            print(error)
+            return 2
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            return 1
+        print("No regressions against %s." % args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
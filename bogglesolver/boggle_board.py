@@ -3,8 +3,83 @@
 """Classes that keep track of the board."""
 
 
-from bogglesolver.twl06 import WORD_LIST
 import random
+from itertools import accumulate
+
+
+# how often each letter appears in the twl06 word list, so generated boards have letters words use.
+LETTER_COUNTS = (
+    ('a', 120954), ('b', 30124), ('c', 64170), ('d', 54873), ('e', 182744), ('f', 20030),
+    ('g', 43537), ('h', 36765), ('i', 140312), ('j', 2674), ('k', 14451), ('l', 84619),
+    ('m', 44855), ('n', 106772), ('o', 103498), ('p', 46600), ('q', 2584), ('r', 112468),
+    ('s', 150216), ('t', 104046), ('u', 52109), ('v', 15429), ('w', 12418), ('x', 4761),
+    ('y', 25870), ('z', 7601),
+)
+# a q is always followed by a u in nearly every word, so like the boggle dice, boards get a "qu" face instead.
+LETTERS = tuple('qu' if letter == 'q' else letter for letter, count in LETTER_COUNTS)
+CUMULATIVE_LETTER_COUNTS = tuple(accumulate(count for letter, count in LETTER_COUNTS))
+
+# the sixteen dice of a standard 4x4 boggle game.
+BOGGLE_DICE = (
+    ('a', 'a', 'e', 'e', 'g', 'n'), ('a', 'b', 'b', 'j', 'o', 'o'), ('a', 'c', 'h', 'o', 'p', 's'),
+    ('a', 'f', 'f', 'k', 'p', 's'), ('a', 'o', 'o', 't', 't', 'w'), ('c', 'i', 'm', 'o', 't', 'u'),
+    ('d', 'e', 'i', 'l', 'r', 'x'), ('d', 'e', 'l', 'r', 'v', 'y'), ('d', 'i', 's', 't', 't', 'y'),
+    ('e', 'e', 'g', 'h', 'n', 'w'), ('e', 'e', 'i', 'n', 's', 'u'), ('e', 'h', 'r', 't', 'v', 'w'),
+    ('e', 'i', 'o', 's', 's', 't'), ('e', 'l', 'r', 't', 't', 'y'), ('h', 'i', 'm', 'n', 'qu', 'u'),
+    ('h', 'l', 'n', 'n', 'r', 'z'),
+)
+
+# the twenty five dice of a 5x5 big boggle game.
+BIG_BOGGLE_DICE = (
+    ('a', 'a', 'a', 'f', 'r', 's'), ('a', 'a', 'e', 'e', 'e', 'e'), ('a', 'a', 'f', 'i', 'r', 's'),
+    ('a', 'd', 'e', 'n', 'n', 'n'), ('a', 'e', 'e', 'e', 'e', 'm'), ('a', 'e', 'e', 'g', 'm', 'u'),
+    ('a', 'e', 'g', 'm', 'n', 'n'), ('a', 'f', 'i', 'r', 's', 'y'), ('b', 'j', 'k', 'qu', 'x', 'z'),
+    ('c', 'c', 'e', 'n', 's', 't'), ('c', 'e', 'i', 'i', 'l', 't'), ('c', 'e', 'i', 'l', 'p', 't'),
+    ('c', 'e', 'i', 'p', 's', 't'), ('d', 'd', 'h', 'n', 'o', 't'), ('d', 'h', 'h', 'l', 'o', 'r'),
+    ('d', 'h', 'l', 'n', 'o', 'r'), ('d', 'h', 'l', 'n', 'o', 'r'), ('e', 'i', 'i', 'i', 't', 't'),
+    ('e', 'm', 'o', 't', 't', 't'), ('e', 'n', 's', 's', 's', 'u'), ('f', 'i', 'p', 'r', 's', 'y'),
+    ('g', 'o', 'r', 'r', 'v', 'w'), ('i', 'p', 'r', 'r', 'r', 'y'), ('n', 'o', 'o', 't', 'u', 'w'),
+    ('o', 'o', 'o', 't', 't', 'u'),
+)
+
+
+def parse_board(text):
+    """
+    Read a board written as text, one letter per index.
+
+    A face of several letters is written in brackets, so "ab[qu]d" is the board ["a", "b", "qu", "d"].
+
+    :param str text: the board.
+    :returns: list of the letters for each index.
+    :raises ValueError: if the brackets don't match up or a face isn't letters.
+    """
+    board = []
+    position = 0
+    text = text.lower()
+    while position < len(text):
+        if text[position] == '[':
+            end = text.find(']', position)
+            if end < 0:
+                raise ValueError("Board %r has a [ without a ]." % text)
+            face = text[position + 1:end]
+            position = end + 1
+        else:
+            face = text[position]
+            position += 1
+        if not face.isalpha():
+            raise ValueError("Board %r has a face %r that isn't letters." % (text, face))
+        board.append(face)
+    return board
+
+
+def format_board(board):
+    """
+    Write a board as text, the reverse of parse_board.
+
+    :param list board: the letters for each index.
+    :returns: str of the letters, faces of several letters in brackets.
+    """
+    return ''.join(face if len(face) == 1 else '[%s]' % face for face in board)
 
 
 class Boggle:
@@ -23,20 +98,39 @@ class Boggle:
     def __str__(self):
         string = ""
         if self.is_full():
+            # every column as wide as the widest face, so faces like "qu" keep the grid lined up.
+            width = max(len(letter) for letter in self.boggle_array)
             for i, letter in enumerate(self.boggle_array):
-                if (i % self.num_columns is 0) and (i is not 0):
+                if i % self.num_columns == 0 and i != 0:
                     string += " |\n"
-                string += " | " + letter
+                string += " | " + letter.ljust(width)
             string += " |\n"
         return string
 
-    def generate_boggle_board(self):
-        """Generate a boggle board by randomly selecting letters from valid words."""
-        combined_words = ''.join(WORD_LIST)
-        self.boggle_array = []
-        for i in range(0, self.num_columns * self.num_rows):
-            random_number = random.randint(0, len(combined_words) - 1)
-            self.boggle_array.append(combined_words[random_number])
+    def generate_boggle_board(self, seed=None, dice=None):
+        """
+        Generate a boggle board by randomly selecting letters.
+
+        Letters are picked as often as they appear in the word list.
+        If dice are given, each index gets a random face of a shuffled die instead,
+            reusing the dice if the board has more indexes than there are dice.
+
+        :param seed: seed for a reproducible board (optional).
+        :type seed: int or None
+        :param dice: dice to roll, like BOGGLE_DICE (optional).
+        :type dice: list or None
+        """
+        rng = random if seed is None else random.Random(seed)
+        size = self.num_columns * self.num_rows
+        if dice is None:
+            self.boggle_array = rng.choices(LETTERS, cum_weights=CUMULATIVE_LETTER_COUNTS, k=size)
+            return
+        shuffled = []
+        while len(shuffled) < size:
+            dice_set = list(dice)
+            rng.shuffle(dice_set)
+            shuffled.extend(dice_set)
+        self.boggle_array = [rng.choice(die) for die in shuffled[:size]]
 
     def insert(self, character, index):
         """
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+"""Upper bounds on the score of every board in a class of boards.
+
+A board class has a set of faces for each cell, and holds every board
+that takes one face from each cell's set. A face may be several letters, like "qu".
+Its bound is the smaller of two scores, found in one search of the class:
+    - where a path can step to a cell, only the face of that cell that could score the most from there.
+      Every path of every board in the class scores no more than that,
+      and a board's score is at most the sum of its paths' scores.
+    - every word that any cell's faces spell, each counted once.
+      Every board in the class only has words from those.
+
+Branch and bound uses this to search a class for its best boards
+without solving every board in it: a class is split into smaller classes on one cell's faces,
+and a class whose bound can't beat the best board found so far is never looked at again.
+"""
+
+
+from bogglesolver.adjacency import get_holes, get_neighbor_table, get_standard_boggle_adjacent
+from bogglesolver.scoring import get_scorer
+from bogglesolver.solve_boggle import BatchSolver
+
+
+class BoundStats:
+
+    """What a branch and bound search did."""
+
+    def __init__(self):
+        # board classes bounded.
+        self.bounds = 0
+        # board classes skipped because their bound couldn't beat the best board.
+        self.pruned = 0
+        # single boards solved in full.
+        self.boards_solved = 0
+
+    def __str__(self):
+        return "%s classes bounded, %s pruned, %s boards solved" % (self.bounds, self.pruned, self.boards_solved)
+
+
+def _faces(cell):
+    """Get the faces a cell can be, a cell that is a string is the one face."""
+    if isinstance(cell, str):
+        return [cell]
+    return list(cell)
+
+
+def upper_bound(edict, cells, columns, rows, scorer=None, adjacency_funct=get_standard_boggle_adjacent,
+                min_word_len=3):
+    """
+    Get a score that no board in a board class can beat.
+
+    :param edict: dictionary to solve against.
+    :param list cells: the faces each cell can be, one list of faces per index.
+        A cell that is a string is that one face, so a board is its own class.
+        A face may be several letters, like "qu".
+    :param int columns: number of columns for the board.
+    :param int rows: number of rows for the board.
+    :param scorer: Scorer for the boards, defaults to get_scorer(adjacency_funct).
+    :param adjacency_funct: adjacency function the boards are solved with.
+    :param int min_word_len: shortest word to score.
+    :returns: int upper bound.
+    """
+    if scorer is None:
+        scorer = get_scorer(adjacency_funct)
+    assert len(cells) == columns * rows, "Board class is not %s cells." % (columns * rows)
+    neighbors = get_neighbor_table(adjacency_funct, columns, rows)
+    cells = [_faces(cell) for cell in cells]
+    visited = bytearray(len(cells))
+    holes = get_holes(adjacency_funct)
+    words = set()
+    bound = 0
+    for index in range(len(cells)):
+        if index in holes:
+            continue
+        visited[index] = 1
+        bound += _best_step(edict, edict.dictionary_root, index, cells, neighbors, visited, [], words, scorer,
+                            min_word_len)
+        visited[index] = 0
+    return min(bound, scorer.score(words))
+
+
+def _best_step(edict, node, index, cells, neighbors, visited, path, words, scorer, min_word_len):
+    """Most any face of cells[index] can score, stepping there from node. Adds the words found to words."""
+    best = 0
+    for face in cells[index]:
+        child = edict.get_last_node(node, face)
+        if child is not None:
+            path.append(face)
+            best = max(best, _bound(edict, child, index, cells, neighbors, visited, path, words, scorer,
+                                    min_word_len))
+            path.pop()
+    return best
+
+
+def _bound(edict, node, a_index, cells, neighbors, visited, path, words, scorer, min_word_len):
+    bound = 0
+    if edict.is_terminal(node):
+        word = ''.join(path)
+        if len(word) >= min_word_len:
+            bound += scorer.score_word(word)
+            words.add(word)
+    if not edict.has_children(node):
+        return bound
+    for index in neighbors[a_index]:
+        if not visited[index]:
+            visited[index] = 1
+            bound += _best_step(edict, node, index, cells, neighbors, visited, path, words, scorer, min_word_len)
+            visited[index] = 0
+    return bound
+
+
+def best_boards(edict, cells, columns, rows, min_score=0, scorer=None, adjacency_funct=get_standard_boggle_adjacent,
+                min_word_len=3, keep_best=True, stats=None):
+    """
+    Search a board class for its high scoring boards, by branch and bound.
+
+    :param edict: dictionary to solve against.
+    :param list cells: the faces each cell can be, one list of faces or a single face per index, like upper_bound.
+    :param int columns: number of columns for the board.
+    :param int rows: number of rows for the board.
+    :param int min_score: lowest score to look for.
+    :param scorer: Scorer for the boards, defaults to get_scorer(adjacency_funct).
+    :param adjacency_funct: adjacency function the boards are solved with.
+    :param int min_word_len: shortest word to score.
+    :param bool keep_best: raise min_score to each better board found,
+        so only boards that beat every board before them are generated and the last is the best.
+        With False every board scoring at least min_score is generated.
+    :param stats: updated with the classes bounded and pruned, and the boards solved (optional).
+    :type stats: BoundStats or None
+    :yields: tuple of the score and board of each board found.
+    """
+    if scorer is None:
+        scorer = get_scorer(adjacency_funct)
+    if stats is None:
+        stats = BoundStats()
+    solver = BatchSolver(edict, columns, rows, min_word_len, adjacency_funct)
+
+    def bound(board_class):
+        stats.bounds += 1
+        return upper_bound(edict, board_class, columns, rows, scorer, adjacency_funct, min_word_len)
+
+    floor = min_score
+    # classes still to search, searched depth first, most promising class last so it is taken next.
+    cells = [_faces(cell) for cell in cells]
+    stack = [(bound(cells), cells)]
+    while stack:
+        class_bound, board_class = stack.pop()
+        if class_bound < floor:
+            stats.pruned += 1
+            continue
+        # split on the cell with the most faces, leaving single boards to be solved.
+        index = max(range(len(board_class)), key=lambda i: len(board_class[i]))
+        if len(board_class[index]) == 1:
+            board = [faces[0] for faces in board_class]
+            stats.boards_solved += 1
+            score = scorer.score(solver.solve(board))
+            if score >= floor:
+                if keep_best:
+                    floor = score + 1
+                yield score, board
+            continue
+        # a single board's bound costs about as much as solving it, so the last split's boards keep this bound.
+        last_split = sum(len(faces) > 1 for faces in board_class) == 1
+        children = []
+        for face in board_class[index]:
+            child = list(board_class)
+            child[index] = [face]
+            child_bound = class_bound if last_split else bound(child)
+            if child_bound >= floor:
+                children.append((child_bound, child))
+            else:
+                stats.pruned += 1
+        children.sort(key=lambda child: child[0])
+        stack.extend(children)
@@ -5,7 +5,7 @@
 import argparse
 import time
 
-from bogglesolver.solve_boggle import SolveBoggle
+from bogglesolver.solve_boggle import SolveBoggle, SolveStats
 from bogglesolver.load_english_dictionary import Edict
 
 
@@ -29,11 +29,15 @@ def main(args=None):
     parser.add_argument('-l', '--length', type=int,
                         help="Change the minimum word length.")
     parser.add_argument('-w', '--words', type=str,
-                        help="Get all words for a given list of letters.")
+                        help="Get all words for a given list of letters, with ? for a blank tile.")
     parser.add_argument('-c', '--columns', type=int,
                         help="Set the number of columns.")
     parser.add_argument('-r', '--rows', type=int,
                         help="Set the number of rows.")
+    parser.add_argument('-s', '--stats', action='store_true',
+                        help="Print what the solver did and how long it took.")
+    parser.add_argument('--paths', action='store_true',
+                        help="Print the board indexes each word is spelled along.")
 
     args = parser.parse_args(args=args)
 
@@ -43,22 +47,30 @@ def main(args=None):
     if args.rows:
         row = args.rows
 
-    if args.words:
-        solver = SolveBoggle(args.words, column, row)
-        print(solver.solve(False))
-
     if args.time:
         game_time = args.time
 
     if args.length:
         min_length = args.length
 
+    if args.words:
+        solver = SolveBoggle()
+        solver.min_word_len = min_length
+        cli_dict = Edict()
+        cli_dict.read_dictionary()
+        words = solver.solve_rack(cli_dict, args.words)
+        for word in words:
+            print(word)
+        print(str(len(words)) + " words found.")
+
     if args.play:
         solver = SolveBoggle()
         solver.set_board(column, row)
         cli_dict = Edict()  # !!! kludge ?
         cli_dict.read_dictionary()  # !!! kludge ?
-        words = solver.solve(cli_dict)
+        stats = SolveStats() if args.stats else None
+        words = solver.solve(cli_dict, stats=stats)
+        paths = solver.solve_paths(cli_dict) if args.paths else {}
         print(solver.boggle)
         print("Play Boggle!!")
         time.sleep(game_time)
@@ -66,8 +78,13 @@ def main(args=None):
         i = 0
         for i, word in enumerate(words):
             if len(word) >= min_length:
-                print(word)
+                if word in paths:
+                    print(word + " " + " ".join(map(str, paths[word])))
+                else:
+                    print(word)
         print(str(i) + " words found.")
+        if stats is not None:
+            print(stats)
         exit()
 
 
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+"""Compile the dictionary into a binary file that can be memory mapped.
+
+Building an Edict means importing the whole twl06 word list and creating
+one _dictnode per letter, which costs a few seconds on every start up.
+Instead the word list can be compiled once into the flat columns
+used by ArrayEdict and written to a file.
+The file is mapped read only, so opening it takes milliseconds and every
+process that maps the same file shares one page-cached copy.
+By default it is kept in the user's cache directory, since the installed
+package directory can be read only.
+
+Build the default dictionary with:
+    python -m bogglesolver.compiled_dictionary
+"""
+
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from bogglesolver.array_dictionary import _ColumnEdict, build_columns, build_dawg_columns
+
+
+MAGIC = b'BOGGLEDT'
+VERSION = 1
+# written in native byte order, used to detect files compiled on another architecture.
+BYTE_ORDER_MARK = 0x01020304
+_HEADER = struct.Struct('=8sIIII')
+
+
+def default_dictionary_path(use_test_words=False):
+    """
+    Get where the compiled twl06 word list is kept.
+
+    :param bool use_test_words: get the path for the test words instead.
+    :returns: path in $XDG_CACHE_HOME/bogglesolver, ~/.cache/bogglesolver if that isn't set.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'bogglesolver', 'twl06_test.bin' if use_test_words else 'twl06.bin')
+
+
+DEFAULT_DICTIONARY_PATH = default_dictionary_path()
+
+
+def write_columns(path, edge_start, targets, terminal, letters):
+    """
+    Write trie columns to a file that MappedEdict can open.
+
+    :param str path: file to write.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    # a temp file of its own, so processes compiling at the same time don't write over each other.
+    handle, temp_path = tempfile.mkstemp(dir=directory or os.curdir, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as out:
+            out.write(_HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, len(terminal), len(targets)))
+            # the 4 byte columns go first so they stay aligned for memoryview.cast.
+            out.write(edge_start.tobytes())
+            out.write(targets.tobytes())
+            out.write(bytes(terminal))
+            out.write(bytes(letters))
+        # mkstemp makes the file readable only by its owner.
+        os.chmod(temp_path, 0o644)
+        # replace atomically so processes mapping the old file are not disturbed.
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def compile_dictionary(path=DEFAULT_DICTIONARY_PATH, use_test_words=False, words=None, minimize=False):
+    """
+    Compile a word list into a binary dictionary file.
+
+    :param str path: file to write.
+    :param bool use_test_words: whether to use the test words or actual words.
+    :param words: words to compile instead of the twl06 lists (optional).
+    :type words: list or None
+    :param bool minimize: compile a DAWG instead of a trie.
+    """
+    if words is None:
+        from bogglesolver import twl06
+        words = twl06.TEST_WORD_LIST if use_test_words else twl06.WORD_LIST
+    if minimize:
+        write_columns(path, *build_dawg_columns(words))
+    else:
+        write_columns(path, *build_columns(words))
+
+
+class MappedEdict(_ColumnEdict):
+
+    """
+    A read only dictionary that walks a compiled dictionary file in place.
+
+    Nodes are integers, node 0 is the dictionary_root.
+    Has the same interface the solver uses on an Edict.
+    """
+
+    def __init__(self, path=DEFAULT_DICTIONARY_PATH):
+        self.path = path
+        with open(path, 'rb') as dict_file:
+            self._map = mmap.mmap(dict_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, byte_order, node_count, edge_count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError("%s is not a compiled dictionary." % path)
+        if byte_order != BYTE_ORDER_MARK:
+            self._map.close()
+            raise ValueError("%s was compiled on a machine with a different byte order." % path)
+
+        offset = _HEADER.size
+        view = memoryview(self._map)
+        edge_start = view[offset:offset + 4 * (node_count + 1)].cast('I')
+        offset += 4 * (node_count + 1)
+        targets = view[offset:offset + 4 * edge_count].cast('I')
+        offset += 4 * edge_count
+        terminal = view[offset:offset + node_count]
+        offset += node_count
+        # letters are searched directly in the map, so keep where they start.
+        self._set_columns(edge_start, targets, terminal, self._map, offset)
+
+    def __getstate__(self):
+        # the map can't be pickled, so other processes map the same file again.
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def close(self):
+        """Release the memory map."""
+        for view in (self._edge_start, self._targets, self._terminal):
+            view.release()
+        self._map.close()
+
+
+def load_compiled_dictionary(path=DEFAULT_DICTIONARY_PATH, use_test_words=False):
+    """
+    Open a compiled dictionary, compiling it first if the file does not exist.
+
+    :param str path: compiled dictionary file.
+    :param bool use_test_words: whether to compile the test words or actual words.
+    :returns: MappedEdict for the file, or an ArrayEdict in memory if the file can't be written.
+    """
+    if not os.path.exists(path):
+        try:
+            compile_dictionary(path, use_test_words)
+        except OSError:
+            from bogglesolver.array_dictionary import ArrayEdict
+            edict = ArrayEdict()
+            edict.read_dictionary(use_test_words)
+            return edict
+    return MappedEdict(path)
+
+
+def main(args=None):
+    """Compile a word list from the command line."""
+    parser = argparse.ArgumentParser(description="Compile a word list into a binary dictionary.")
+    parser.add_argument('words', nargs='?', type=str,
+                        help="File with one word per line. Defaults to the twl06 word list.")
+    parser.add_argument('-o', '--output', type=str, default=DEFAULT_DICTIONARY_PATH,
+                        help="Where to write the compiled dictionary.")
+    parser.add_argument('-t', '--test-words', action='store_true',
+                        help="Compile the test words instead of the twl06 word list.")
+    parser.add_argument('-d', '--dawg', action='store_true',
+                        help="Compile a minimized DAWG, which is several times smaller than the trie.")
+    args = parser.parse_args(args=args)
+
+    words = None
+    if args.words:
+        with open(args.words) as word_file:
+            words = [line.strip() for line in word_file]
+    compile_dictionary(args.output, args.test_words, words, args.dawg)
+    print("Compiled dictionary written to %s (%s bytes)." % (args.output, os.path.getsize(args.output)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
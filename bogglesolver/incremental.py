@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+"""Keep a board solved while its letters are changed one at a time.
+
+Every path that spells a word is kept, indexed by the board indexes it uses.
+Changing a letter only changes the words on paths through that index,
+so only those paths are dropped and searched for again.
+A path through the changed index can't start further away from it than the longest word,
+so the search only starts near the change, and gives up on paths that can no longer reach it.
+"""
+
+
+from collections import Counter, deque
+
+from bogglesolver.adjacency import get_holes, get_neighbor_table, get_standard_boggle_adjacent
+
+
+class IncrementalSolver:
+
+    """
+    Solve a board, then keep its words up to date as letters are inserted.
+
+    :param boggle: the board, a Boggle. It should only be changed through insert.
+    :param edict: dictionary to solve against.
+    :param int min_word_len: shortest word to find.
+    :param adjacency_funct: adjacency function the neighbor table is built from.
+    :param max_word_len: longest word in edict (optional).
+        Needed if the dictionary has no max_word_length method.
+    :type max_word_len: int or None
+    """
+
+    def __init__(self, boggle, edict, min_word_len=3, adjacency_funct=get_standard_boggle_adjacent,
+                 max_word_len=None):
+        assert boggle.is_full(), "Boggle board has not been set."
+        self.boggle = boggle
+        self.edict = edict
+        self.min_word_len = min_word_len
+        if max_word_len is None:
+            max_word_len = edict.max_word_length()
+        self.max_word_len = max_word_len
+        self._neighbors = get_neighbor_table(adjacency_funct, boggle.num_columns, boggle.num_rows)
+        self._holes = get_holes(adjacency_funct)
+        # indexes each index is a neighbor of, for the distances back to a changed index.
+        self._reverse_neighbors = [[] for _ in self._neighbors]
+        for index, adjacent in enumerate(self._neighbors):
+            for neighbor in adjacent:
+                self._reverse_neighbors[neighbor].append(index)
+        # path of board indexes: word it spells.
+        self._paths = {}
+        # board index: set of the paths that use it.
+        self._paths_by_index = [set() for _ in self._neighbors]
+        # word: number of paths that spell it.
+        self._path_counts = Counter()
+        # letter replaced, its index, and the paths removed by the last insert.
+        self._last_insert = None
+
+        visited = bytearray(len(self._neighbors))
+        for index in range(len(self._neighbors)):
+            self._search_from(index, visited)
+
+    @property
+    def words(self):
+        """Sorted list of all the words on the board."""
+        return sorted(self._path_counts)
+
+    def paths(self, word):
+        """
+        Get every path that spells a word.
+
+        :param str word: word to look for.
+        :returns: list of tuples of board indexes, empty if the word isn't on the board.
+        """
+        return sorted(path for path, path_word in self._paths.items() if path_word == word)
+
+    def insert(self, character, index):
+        """
+        Insert a character into the board, and update the words.
+
+        :param str character: character to insert.
+        :param int index: index to insert the character at.
+        :returns: tuple of the sets of words added and removed by the change.
+        """
+        before = set(self._path_counts)
+        removed = [(path, self._paths[path]) for path in self._paths_by_index[index]]
+        self._last_insert = (self.boggle.boggle_array[index], index, removed)
+        self.boggle.insert(character, index)
+        for path, word in removed:
+            self._remove_path(path)
+
+        distances = self._distances_to(index)
+        visited = bytearray(len(self._neighbors))
+        for start, distance in enumerate(distances):
+            if distance is not None and distance < self.max_word_len:
+                self._search_from(start, visited, index, distances)
+
+        after = set(self._path_counts)
+        return after - before, before - after
+
+    def undo(self):
+        """
+        Undo the last insert, without searching the board again.
+
+        Only the last insert can be undone.
+        """
+        assert self._last_insert is not None, "Nothing to undo."
+        character, index, removed = self._last_insert
+        self._last_insert = None
+        # every path through index was removed by the insert, so the ones there now are the ones it added.
+        for path in list(self._paths_by_index[index]):
+            self._remove_path(path)
+        self.boggle.insert(character, index)
+        for path, word in removed:
+            self._add_path(path, word)
+
+    def _distances_to(self, target):
+        """
+        Get the fewest steps from every index to target.
+
+        :returns: list with the steps for each index, None where target can't be reached.
+        """
+        distances = [None] * len(self._neighbors)
+        distances[target] = 0
+        queue = deque([target])
+        while queue:
+            index = queue.popleft()
+            for previous in self._reverse_neighbors[index]:
+                if distances[previous] is None:
+                    distances[previous] = distances[index] + 1
+                    queue.append(previous)
+        return distances
+
+    def _search_from(self, start, visited, through=None, distances=None):
+        """
+        Add every path starting at start that spells a word.
+
+        :param int start: index paths start at.
+        :param bytearray visited: all zero visited flags, all zero again when the search returns.
+        :param through: only add paths that use this index (optional).
+        :type through: int or None
+        :param distances: steps from each index to through, from _distances_to.
+        """
+        if start in self._holes:
+            return
+        letter = self.boggle.boggle_array[start]
+        node = self.edict.get_last_node(self.edict.dictionary_root, letter)
+        if node is not None:
+            visited[start] = 1
+            self._search(start, node, visited, [start], [letter], through, distances)
+            visited[start] = 0
+
+    def _search(self, a_index, node, visited, path, letters, through, distances):
+        edict = self.edict
+        if edict.is_terminal(node) and (through is None or visited[through]):
+            word = ''.join(letters)
+            if len(word) >= self.min_word_len:
+                self._add_path(tuple(path), word)
+        if not edict.has_children(node):
+            return
+        boggle_array = self.boggle.boggle_array
+        for index in self._neighbors[a_index]:
+            if visited[index]:
+                continue
+            # a path that hasn't used through yet needs at least distance more indexes to get there.
+            if through is not None and not visited[through]:
+                distance = distances[index]
+                if distance is None or len(path) + 1 + distance > self.max_word_len:
+                    continue
+            letter = boggle_array[index]
+            new_node = edict.get_last_node(node, letter)
+            if new_node is not None:
+                visited[index] = 1
+                path.append(index)
+                letters.append(letter)
+                self._search(index, new_node, visited, path, letters, through, distances)
+                letters.pop()
+                path.pop()
+                visited[index] = 0
+
+    def _add_path(self, path, word):
+        self._paths[path] = word
+        for index in path:
+            self._paths_by_index[index].add(path)
+        self._path_counts[word] += 1
+
+    def _remove_path(self, path):
+        word = self._paths.pop(path)
+        for index in path:
+            self._paths_by_index[index].discard(path)
+        self._path_counts[word] -= 1
+        if not self._path_counts[word]:
+            del self._path_counts[word]
@@ -3,10 +3,6 @@
 """Stores the dictionary in a linked list."""
 
 
-from bogglesolver.twl06 import WORD_LIST
-from bogglesolver.twl06 import TEST_WORD_LIST
-
-
 class _dictnode:
 
     """
@@ -53,6 +49,8 @@ class Edict:
 
     def __init__(self):
         self.dictionary_root = _dictnode()
+        # counts changes to the words, so anything cached from the dictionary can tell it is out of date.
+        self.generation = 0
 
     def read_dictionary(self, use_test_words=False):
         """
@@ -61,11 +59,13 @@ class Edict:
         :param bool use_test_words: whether to use
             the test words or actual words.
         """
+        # imported here, the word list takes seconds to import and most imports don't need it.
+        from bogglesolver import twl06
         words = None
         if use_test_words:
-            words = TEST_WORD_LIST
+            words = twl06.TEST_WORD_LIST
         else:
-            words = WORD_LIST
+            words = twl06.WORD_LIST
         for word in reversed(words):
             self.add_word(word.lower())
 
@@ -81,6 +81,48 @@ class Edict:
         node = self.get_last_node(self.dictionary_root, word.lower())
         return node.word != "" if node else False
 
+    def is_terminal(self, node):
+        """
+        Determine if a word ends at the node.
+
+        :param _dictnode node: node in the Edict.
+        :returns: True if a word ends at the node.
+        """
+        return node.word != ""
+
+    def has_children(self, node):
+        """
+        Determine if any words continue past the node.
+
+        :param _dictnode node: node in the Edict.
+        :returns: True if the node has at least one child.
+        """
+        return bool(node.letters)
+
+    def iter_children(self, node):
+        """
+        Get every letter that continues past the node.
+
+        :param _dictnode node: node in the Edict.
+        :returns: iterator of (letter, child node) tuples.
+        """
+        return iter(node.letters.items())
+
+    def max_word_length(self):
+        """
+        Get the length of the longest word in the dictionary.
+
+        :returns: int length, 0 if the dictionary is empty.
+        """
+        longest = 0
+        stack = [(self.dictionary_root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.word:
+                longest = max(longest, depth)
+            stack.extend((child, depth + 1) for child in node.letters.values())
+        return longest
+
     def add_word(self, word):
         """
         Add a word to the dictionary.
@@ -90,6 +132,7 @@ class Edict:
         :param str word: word to add.
         """
         self.dictionary_root.add_letter(word.lower(), 0, len(word))
+        self.generation += 1
 
     def get_words(self, node, all_words=[]):
         """
@@ -117,7 +160,33 @@ class Edict:
         :returns: True if the node has a path for the given letter, False Otherwise
         """
         for l in letter:
-            if l not in node.letters.keys():
+            node = node.letters.get(l)
+            if node is None:
                 return None
-            node = node.letters[l]
         return node
+
+
+# the dictionary engines by the names the command line tools take.
+DICTIONARIES = ("edict", "array", "dawg", "mapped")
+
+
+def load_dictionary(kind, use_test_words=False):
+    """
+    Load one of the dictionary engines.
+
+    :param str kind: one of DICTIONARIES.
+    :param bool use_test_words: whether to use the test words or actual words.
+    :returns: the dictionary.
+    """
+    if kind == "edict":
+        edict = Edict()
+    elif kind in ("array", "dawg"):
+        from bogglesolver.array_dictionary import ArrayEdict
+        edict = ArrayEdict(minimize=kind == "dawg")
+    elif kind == "mapped":
+        from bogglesolver.compiled_dictionary import default_dictionary_path, load_compiled_dictionary
+        return load_compiled_dictionary(default_dictionary_path(use_test_words), use_test_words)
+    else:
+        raise ValueError("Unknown dictionary %r, expected one of %s." % (kind, ", ".join(DICTIONARIES)))
+    edict.read_dictionary(use_test_words)
+    return edict
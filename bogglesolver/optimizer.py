@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+
+"""Search for high scoring boards.
+
+Simulated annealing over single letter changes:
+each step changes one letter of the board, and keeps the change if the board scores more,
+or with a chance that shrinks as the change costs more and as the search cools.
+With a starting temperature of 0 it is plain hill climbing.
+A rejected change is undone without solving the board again.
+
+    python -m bogglesolver.optimizer --iterations 20000 --restarts 4 --workers 4
+
+Each candidate board is solved in full by default,
+which is fastest for boards up to about 10x10, where a changed letter is reachable from every other.
+For bigger boards, incremental=True re-searches only the paths through the changed letter (see IncrementalSolver).
+"""
+
+
+import argparse
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bogglesolver.adjacency import ADJACENCY, get_standard_boggle_adjacent
+from bogglesolver.boggle_board import Boggle, LETTERS, CUMULATIVE_LETTER_COUNTS
+from bogglesolver.incremental import IncrementalSolver
+from bogglesolver.load_english_dictionary import DICTIONARIES, load_dictionary
+from bogglesolver.scoring import get_scorer
+from bogglesolver.solve_boggle import BatchSolver, BatchStats, get_pool_context
+
+
+# what each worker process anneals with, set once per process by _init_worker.
+_worker_state = {}
+
+
+def _init_worker(edict, options):
+    _worker_state['anneal'] = (edict, options)
+
+
+def _anneal_seed(seed):
+    edict, options = _worker_state['anneal']
+    return anneal(edict, seed=seed, **options)
+
+
+def anneal(edict, columns=4, rows=4, iterations=10000, seed=None, scorer=None,
+           adjacency_funct=get_standard_boggle_adjacent, min_word_len=3, start_temperature=10.0,
+           end_temperature=0.1, incremental=False, max_word_len=None):
+    """
+    Search for a high scoring board from one random board.
+
+    :param edict: dictionary to solve against.
+    :param int columns: number of columns for the board.
+    :param int rows: number of rows for the board.
+    :param int iterations: letter changes to try.
+    :param seed: seed for the starting board and the changes tried (optional).
+    :param scorer: Scorer for the boards, defaults to get_scorer(adjacency_funct).
+    :param adjacency_funct: adjacency function the boards are solved with.
+    :param int min_word_len: shortest word to score.
+    :param float start_temperature: points a change can lose and still be kept about a third of the time,
+        at the start of the search. 0 only keeps changes that don't lose points.
+    :param float end_temperature: the same, at the end of the search.
+    :param bool incremental: keep the board solved with an IncrementalSolver,
+        instead of solving every candidate in full.
+    :param max_word_len: longest word in edict, for the IncrementalSolver (optional).
+    :returns: tuple of the best score, the board that scored it, and the candidate boards scored.
+    """
+    if scorer is None:
+        scorer = get_scorer(adjacency_funct)
+    rng = random.Random(seed)
+    boggle = Boggle(columns, rows)
+    boggle.generate_boggle_board(seed=rng.getrandbits(64))
+    board = boggle.boggle_array
+    cells = len(board)
+
+    if incremental:
+        solver = IncrementalSolver(boggle, edict, min_word_len, adjacency_funct, max_word_len)
+        score = scorer.score(solver.words)
+    else:
+        solver = BatchSolver(edict, columns, rows, min_word_len, adjacency_funct)
+        score = scorer.score(solver.solve(board))
+    best_score, best_board = score, list(board)
+
+    temperature = start_temperature
+    cooling = 1.0
+    if start_temperature > 0 and iterations:
+        cooling = (end_temperature / start_temperature) ** (1.0 / iterations)
+    candidates = 1
+    for _ in range(iterations):
+        index = rng.randrange(cells)
+        old_letter = board[index]
+        letter = rng.choices(LETTERS, cum_weights=CUMULATIVE_LETTER_COUNTS)[0]
+        if letter == old_letter:
+            continue
+        if incremental:
+            added, removed = solver.insert(letter, index)
+            new_score = score + scorer.score(added) - scorer.score(removed)
+        else:
+            board[index] = letter
+            new_score = scorer.score(solver.solve(board))
+        candidates += 1
+
+        if new_score >= score or (temperature > 0 and rng.random() < math.exp((new_score - score) / temperature)):
+            score = new_score
+            if score > best_score:
+                best_score, best_board = score, list(board)
+        elif incremental:
+            solver.undo()
+        else:
+            board[index] = old_letter
+        temperature *= cooling
+    return best_score, best_board, candidates
+
+
+def optimize_board(edict, columns=4, rows=4, iterations=10000, restarts=1, workers=None, seed=None, stats=None,
+                   **options):
+    """
+    Search for a high scoring board, from several random boards.
+
+    :param edict: dictionary to solve against.
+    :param int columns: number of columns for the board.
+    :param int rows: number of rows for the board.
+    :param int iterations: letter changes to try from each starting board.
+    :param int restarts: number of random boards to start from.
+    :param workers: number of processes to run the restarts in (optional).
+        Where fork is available the workers share edict.
+    :type workers: int or None
+    :param seed: seed for the whole search (optional).
+    :param stats: updated with the candidate boards scored and time taken (optional).
+    :type stats: BatchStats or None
+    :param options: passed on to anneal, like scorer, adjacency_funct and start_temperature.
+    :returns: tuple of the best score and the board that scored it.
+    """
+    if stats is None:
+        stats = BatchStats()
+    if options.get('incremental') and options.get('max_word_len') is None:
+        # found once here, instead of once per restart.
+        options['max_word_len'] = edict.max_word_length()
+    options.update(columns=columns, rows=rows, iterations=iterations)
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in range(restarts)]
+
+    start = time.time()
+    if workers is None or workers <= 1:
+        results = [anneal(edict, seed=restart_seed, **options) for restart_seed in seeds]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=get_pool_context(), initializer=_init_worker,
+                                 initargs=(edict, options)) as pool:
+            results = list(pool.map(_anneal_seed, seeds))
+    stats.boards += sum(candidates for score, board, candidates in results)
+    stats.seconds += time.time() - start
+
+    best_score, best_board, candidates = max(results, key=lambda result: result[0])
+    return best_score, best_board
+
+
+def main(args=None):
+    """Search for a high scoring board from the command line."""
+    parser = argparse.ArgumentParser(description="Search for a high scoring boggle board.")
+    parser.add_argument('-c', '--columns', type=int, default=4,
+                        help="Set the number of columns.")
+    parser.add_argument('-r', '--rows', type=int, default=4,
+                        help="Set the number of rows.")
+    parser.add_argument('-n', '--iterations', type=int, default=10000,
+                        help="Letter changes to try from each starting board.")
+    parser.add_argument('--restarts', type=int, default=1,
+                        help="Number of random boards to start from.")
+    parser.add_argument('-w', '--workers', type=int,
+                        help="Number of processes to run the restarts in.")
+    parser.add_argument('-s', '--seed', type=int,
+                        help="Seed, to find the same board again.")
+    parser.add_argument('-a', '--adjacency', choices=sorted(ADJACENCY), default="standard",
+                        help="Adjacency function to solve with.")
+    parser.add_argument('-d', '--dictionary', choices=DICTIONARIES, default="edict",
+                        help="Dictionary engine to solve with.")
+    parser.add_argument('--temperature', type=float, default=10.0,
+                        help="Starting temperature, 0 for hill climbing.")
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help="Re-search only paths through the changed letter. Faster for big boards.")
+    args = parser.parse_args(args=args)
+
+    edict = load_dictionary(args.dictionary)
+    stats = BatchStats()
+    score, board = optimize_board(edict, args.columns, args.rows, args.iterations, args.restarts, args.workers,
+                                  args.seed, stats, adjacency_funct=ADJACENCY[args.adjacency],
+                                  start_temperature=args.temperature, incremental=args.incremental)
+    boggle = Boggle(args.columns, args.rows)
+    boggle.set_array(board)
+    print(boggle)
+    print("Score: %s" % score)
+    print(stats)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
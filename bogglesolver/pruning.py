@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Prune the dictionary down to the words a board's letters could spell.
+
+A board can only spell words that use each of its letters at most once,
+however the letters are arranged.
+Searching a small dictionary of just those words means the board search
+never walks into a branch that needs a letter the board doesn't have.
+
+Pruning a dictionary costs more than solving one small board with the full one,
+so it pays off when the same letters are solved many times,
+like when searching over rearrangements of a board.
+"""
+
+
+import threading
+import weakref
+from collections import OrderedDict
+
+from bogglesolver.load_english_dictionary import Edict
+from bogglesolver.rack import rack_words
+
+
+# pruned dictionaries kept for each dictionary.
+CACHE_SIZE = 256
+
+# dictionary: tuple of its generation when pruned and an LRU of sorted letters: pruned Edict.
+# Held by weak reference, so the cache goes when the dictionary does.
+_pruned = weakref.WeakKeyDictionary()
+_pruned_lock = threading.Lock()
+
+
+def spellable_words(edict, letters):
+    """
+    Get every word in the dictionary that can be spelled from the letters.
+
+    Each letter can be used as many times as it is in letters.
+    A letter may be several characters, like the "qu" face of a boggle die.
+
+    :param edict: dictionary to search.
+    :param letters: the letters available, for example a boggle array.
+    :returns: list of the words found.
+    """
+    return list(rack_words(edict, letters))
+
+
+def prune_dictionary(edict, letters):
+    """
+    Get a dictionary of only the words that can be spelled from the letters.
+
+    Pruned dictionaries are cached by letter count for each dictionary,
+        so boards with the same letters in any order share one.
+        Adding words to the dictionary drops its cached ones.
+
+    :param edict: dictionary to prune.
+    :param letters: the letters available, for example a boggle array.
+    :returns: Edict with the spellable words.
+    """
+    key = tuple(sorted(letters))
+    # dictionaries that can't change have no generation.
+    generation = getattr(edict, 'generation', 0)
+    with _pruned_lock:
+        cached = _pruned.get(edict)
+        if cached is None or cached[0] != generation:
+            cached = (generation, OrderedDict())
+            _pruned[edict] = cached
+        lru = cached[1]
+        pruned = lru.get(key)
+        if pruned is not None:
+            lru.move_to_end(key)
+            return pruned
+
+    # pruned outside the lock, so other boards aren't held up. Two threads may both prune the same letters.
+    pruned = Edict()
+    for word in spellable_words(edict, key):
+        pruned.add_word(word)
+    with _pruned_lock:
+        lru[key] = pruned
+        if len(lru) > CACHE_SIZE:
+            lru.popitem(last=False)
+    return pruned
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""Find the words a rack of letters can spell, like a scrabble rack.
+
+Solving a board with get_scrabble_adjacent tries every ordering of the board's letters.
+A rack only matters by how many of each letter it has, so this walks the dictionary instead,
+taking a letter from the rack for each step and putting it back on the way out.
+Each word is reached once, however many times its letters repeat,
+and the walk stops as soon as the rack has no letter the dictionary can continue with.
+"""
+
+
+from collections import Counter
+
+from bogglesolver.boggle_board import parse_board
+
+
+BLANK = "?"
+
+
+def parse_rack(rack):
+    """
+    Read a rack written as text.
+
+    Blank tiles are written as ?, and faces of several letters in brackets like a board, so "ab?[qu]" is
+    the letters a, b and qu and one blank.
+
+    :param str rack: the rack.
+    :returns: tuple of the list of letters and the number of blanks.
+    :raises ValueError: if the rest of the rack isn't letters.
+    """
+    blanks = rack.count(BLANK)
+    return parse_board(rack.replace(BLANK, "")), blanks
+
+
+def rack_words(edict, letters, blanks=0):
+    """
+    Find every word the letters can spell.
+
+    Each letter can be used as many times as it is in letters, and each blank as any one letter.
+    A letter may be several characters, like the "qu" face of a boggle die.
+
+    :param edict: dictionary to search.
+    :param letters: the letters available.
+    :param int blanks: number of blank tiles.
+    :returns: set of the words found.
+    """
+    counts = Counter(letters)
+    # letters of several characters can't be matched to a single child, they are looked up whole.
+    faces = [face for face in counts if len(face) > 1]
+    words = set()
+    _walk(edict, edict.dictionary_root, counts, faces, blanks, [], words)
+    return words
+
+
+def _walk(edict, node, counts, faces, blanks, path, words):
+    if edict.is_terminal(node):
+        words.add(''.join(path))
+    if not edict.has_children(node):
+        return
+    for letter, child in edict.iter_children(node):
+        count = counts.get(letter)
+        if count:
+            counts[letter] = count - 1
+            path.append(letter)
+            _walk(edict, child, counts, faces, blanks, path, words)
+            path.pop()
+            counts[letter] = count
+        elif blanks:
+            # the blank is only needed for letters that have run out, anything else uses the letter.
+            path.append(letter)
+            _walk(edict, child, counts, faces, blanks - 1, path, words)
+            path.pop()
+    for face in faces:
+        count = counts[face]
+        if count:
+            child = edict.get_last_node(node, face)
+            if child is not None:
+                counts[face] = count - 1
+                path.append(face)
+                _walk(edict, child, counts, faces, blanks, path, words)
+                path.pop()
+                counts[face] = count
+
+
+def solve_rack(edict, rack, min_word_len=3):
+    """
+    Find every word a rack can spell.
+
+    :param edict: dictionary to search.
+    :param rack: the rack, as text for parse_rack or a list of letters.
+    :param int min_word_len: shortest word to include.
+    :returns: sorted list of the words found.
+    """
+    if isinstance(rack, str):
+        letters, blanks = parse_rack(rack)
+    else:
+        letters = [letter for letter in rack if letter != BLANK]
+        blanks = len(rack) - len(letters)
+    return sorted(word for word in rack_words(edict, letters, blanks) if len(word) >= min_word_len)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""Score words and solved boards.
+
+A Scorer gives each word points for its length from a table,
+plus the value of each of its letters.
+Word scores are remembered, so scoring many boards that share words,
+like the boards a board search generates, only scores each word once.
+"""
+
+
+from array import array
+
+from bogglesolver.adjacency import get_scrabble_adjacent
+
+
+# typecode of every array of scores, 8 bytes on every platform.
+SCORE_TYPECODE = 'q'
+
+# points by word length, lengths past the end of the table get the last entry.
+BOGGLE_POINTS = (0, 0, 0, 1, 1, 2, 3, 5, 11)
+# big boggle doesn't count three letter words.
+BIG_BOGGLE_POINTS = (0, 0, 0, 0, 1, 2, 3, 5, 11)
+
+SCRABBLE_LETTER_VALUES = {
+    'a': 1, 'b': 3, 'c': 3, 'd': 2, 'e': 1, 'f': 4, 'g': 2, 'h': 4, 'i': 1, 'j': 8, 'k': 5, 'l': 1, 'm': 3,
+    'n': 1, 'o': 1, 'p': 3, 'q': 10, 'r': 1, 's': 1, 't': 1, 'u': 1, 'v': 4, 'w': 4, 'x': 8, 'y': 4, 'z': 10,
+}
+
+
+class _WordScores(dict):
+
+    """Scores of the words seen so far, scoring new words as they are looked up."""
+
+    def __init__(self, score):
+        dict.__init__(self)
+        self._score = score
+
+    def __missing__(self, word):
+        score = self[word] = self._score(word)
+        return score
+
+
+class Scorer:
+
+    """
+    Score words by their length and letters.
+
+    A word scores its points from length_points plus the value of each of its letters.
+
+    :param length_points: points indexed by word length (optional).
+        Words longer than the table score its last entry.
+    :type length_points: tuple or None
+    :param letter_values: dict of letter: points (optional). Letters not in it score nothing.
+    :type letter_values: dict or None
+    """
+
+    def __init__(self, length_points=BOGGLE_POINTS, letter_values=None):
+        self.length_points = tuple(length_points) if length_points else ()
+        self.letter_values = dict(letter_values) if letter_values else {}
+        self._scores = _WordScores(self._score_word)
+
+    def _score_word(self, word):
+        score = 0
+        if self.length_points:
+            score += self.length_points[min(len(word), len(self.length_points) - 1)]
+        if self.letter_values:
+            score += sum(self.letter_values.get(letter, 0) for letter in word)
+        return score
+
+    def score_word(self, word):
+        """
+        Score one word.
+
+        :param str word: word to score.
+        :returns: int points.
+        """
+        return self._scores[word]
+
+    def score(self, words):
+        """
+        Score a solved board.
+
+        :param words: the words found on the board, like the list from SolveBoggle.solve.
+        :returns: int total points.
+        """
+        return sum(map(self._scores.__getitem__, words))
+
+    def score_words(self, words):
+        """
+        Score each word of a solved board.
+
+        :param words: the words found on the board.
+        :returns: array of the points for each word, in the same order.
+        """
+        return array(SCORE_TYPECODE, map(self._scores.__getitem__, words))
+
+    def score_batch(self, solutions):
+        """
+        Score many solved boards.
+
+        :param solutions: iterable of word lists, like the results of solve_many.
+        :returns: array of the total points for each board, in the same order.
+        """
+        get_score = self._scores.__getitem__
+        return array(SCORE_TYPECODE, [sum(map(get_score, words)) for words in solutions])
+
+    def clear(self):
+        """Forget the remembered word scores."""
+        self._scores.clear()
+
+
+BOGGLE_SCORER = Scorer()
+SCRABBLE_SCORER = Scorer(length_points=None, letter_values=SCRABBLE_LETTER_VALUES)
+
+
+def get_scorer(adjacency_funct):
+    """
+    Get the usual scorer for an adjacency function.
+
+    :param adjacency_funct: adjacency function the boards are solved with.
+    :returns: SCRABBLE_SCORER for get_scrabble_adjacent, BOGGLE_SCORER otherwise.
+    """
+    if adjacency_funct is get_scrabble_adjacent:
+        return SCRABBLE_SCORER
+    return BOGGLE_SCORER
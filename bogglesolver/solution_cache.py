@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+"""Cache of solved boards.
+
+The words on a board only depend on the board, its size, the minimum word length
+and the adjacency rule, so a solved board never has to be solved again.
+Recently used solutions are kept in memory, and optionally in a sqlite file
+so they survive restarts and can be shared between processes.
+The memory is each process's own, only the sqlite file is shared.
+"""
+
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from bogglesolver.adjacency import adjacency_key
+
+
+class SolutionCache:
+
+    """
+    A least recently used cache of solutions, with an optional sqlite file behind it.
+
+    :param int max_size: most solutions to keep in memory.
+    :param path: sqlite file to also keep solutions in (optional).
+    :type path: str or None
+    :param int max_disk_size: most solutions to keep in the sqlite file.
+
+    The sqlite file is opened when it is first used, by each process that uses it,
+    so a cache made before forking is safe to use in the forked processes.
+    """
+
+    def __init__(self, max_size=1024, path=None, max_disk_size=100000):
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._solutions = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        # connections opened before a fork, which sqlite can't use or close in the forked process.
+        self._forked_dbs = []
+
+    def _connect(self):
+        """Get this process's connection to the sqlite file, or None if there is no file."""
+        if self.path is None:
+            return None
+        if self._db is not None and self._db_pid != os.getpid():
+            self._forked_dbs.append(self._db)
+            self._db = None
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db_pid = os.getpid()
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                             "(key TEXT PRIMARY KEY, words TEXT, last_used REAL)")
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def make_key(rows, columns, board, min_word_len, adjacency_funct):
+        """
+        Make the cache key for a board.
+
+        :param int rows: number of rows for the board.
+        :param int columns: number of columns for the board.
+        :param board: letters of the board.
+        :type board: str or list
+        :param int min_word_len: shortest word in the solution.
+        :param adjacency_funct: adjacency function the board is solved with, see adjacency_key.
+        :returns: str key.
+        :raises ValueError: if adjacency_funct has no lasting name, like a lambda.
+        """
+        return json.dumps([rows, columns, list(board), min_word_len, adjacency_key(adjacency_funct)])
+
+    def get(self, key):
+        """
+        Get a cached solution.
+
+        :param str key: key from make_key.
+        :returns: new list of words, or None if the board has not been cached.
+        """
+        with self._lock:
+            if key in self._solutions:
+                self._solutions.move_to_end(key)
+                self.hits += 1
+                return list(self._solutions[key])
+            db = self._connect()
+            if db is not None:
+                row = db.execute("SELECT words FROM solutions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+                    self.disk_hits += 1
+                    words = json.loads(row[0])
+                    self._remember(key, words)
+                    return words
+            self.misses += 1
+            return None
+
+    def put(self, key, words):
+        """
+        Cache a solution.
+
+        :param str key: key from make_key.
+        :param list words: the solution.
+        """
+        with self._lock:
+            self._remember(key, words)
+            db = self._connect()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (key, json.dumps(words), time.time()))
+                count = db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+                if count > self.max_disk_size:
+                    db.execute("DELETE FROM solutions WHERE key IN "
+                               "(SELECT key FROM solutions ORDER BY last_used LIMIT ?)",
+                               (count - self.max_disk_size,))
+                    self.disk_evictions += count - self.max_disk_size
+                db.commit()
+
+    def get_or_solve(self, key, solve):
+        """
+        Get a cached solution, solving and caching it if it is not cached.
+
+        :param str key: key from make_key.
+        :param solve: function that takes no arguments and returns the solution.
+        :returns: list of words.
+        """
+        words = self.get(key)
+        if words is None:
+            words = solve()
+            self.put(key, words)
+        return words
+
+    def _remember(self, key, words):
+        # kept as a tuple, so nothing the caller does to its list changes the cache.
+        self._solutions[key] = tuple(words)
+        self._solutions.move_to_end(key)
+        while len(self._solutions) > self.max_size:
+            self._solutions.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups that were found in memory or on disk."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / float(lookups) if lookups else 0.0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Everything but the disk size counts this process only.
+
+        :returns: dict of the cache size, limits, hits, misses, evictions and hit rate.
+        """
+        with self._lock:
+            stats = dict(size=len(self._solutions), max_size=self.max_size,
+                         hits=self.hits, disk_hits=self.disk_hits, misses=self.misses,
+                         evictions=self.evictions, hit_rate=self.hit_rate)
+            db = self._connect()
+            if db is not None:
+                stats['disk_size'] = db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+                stats['max_disk_size'] = self.max_disk_size
+                stats['disk_evictions'] = self.disk_evictions
+        return stats
+
+    def close(self):
+        """Close the sqlite file, it is opened again if the cache is used."""
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
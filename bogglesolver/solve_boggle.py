@@ -3,9 +3,121 @@
 """Class to solve the boggle boggle_board."""
 
 
+import multiprocessing
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
 from bogglesolver.boggle_board import Boggle
-from bogglesolver.load_english_dictionary import Edict
 from bogglesolver.adjacency import *
+from bogglesolver.pruning import prune_dictionary
+from bogglesolver.rack import solve_rack
+
+
+# what each worker process searches with, set once per process by _init_worker.
+_worker_state = {}
+
+# paths longer than this are searched with an explicit stack instead of recursion,
+# so dictionaries with very long words don't reach the recursion limit.
+RECURSION_DEPTH = 500
+
+
+def get_pool_context():
+    """
+    Get the multiprocessing context for worker pools.
+
+    Fork lets workers share the parent's dictionary copy-on-write
+        instead of pickling it to every process.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _init_worker(solver, edict, neighbors, visited, instrument):
+    _worker_state['search'] = (solver, edict, neighbors, visited, instrument)
+
+
+def _search_indexes(start_indexes):
+    solver, edict, neighbors, visited, instrument = _worker_state['search']
+    words = set()
+    stats = SolveStats() if instrument else None
+    solver._search_from(start_indexes, edict, neighbors, visited, words, stats=stats)
+    return words, stats
+
+
+def path_typecode(cells):
+    """
+    Get the smallest array typecode that holds every index of a board.
+
+    :param int cells: number of cells on the board.
+    :returns: str typecode for array.array.
+    """
+    if cells <= 1 << 8:
+        return 'B'
+    if cells <= 1 << 16:
+        return 'H'
+    return 'I'
+
+
+class SolveStats:
+
+    """
+    What a solve did, and where the time went.
+
+    Pass one to SolveBoggle.solve to have it filled in.
+    Solves without one don't count anything.
+    """
+
+    def __init__(self):
+        # board indexes added to a path.
+        self.nodes_visited = 0
+        # get_last_node calls.
+        self.trie_lookups = 0
+        # lookups with no path in the dictionary, where the search was pruned.
+        self.dead_ends = 0
+        # most letters in a path.
+        self.max_depth = 0
+        # words found, counting the same word found on different paths.
+        self.words_found = 0
+        # seconds spent in each phase of the solve.
+        self.timings = {}
+
+    def add_time(self, phase, seconds):
+        """
+        Add time spent in a phase.
+
+        :param str phase: name of the phase.
+        :param float seconds: time spent.
+        """
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def merge(self, other):
+        """
+        Add the counts and timings from another search, like one run in a worker process.
+
+        Timings are added up, so a phase run in parallel workers counts the time of every worker.
+
+        :param SolveStats other: stats to add.
+        """
+        for phase, seconds in other.timings.items():
+            self.add_time(phase, seconds)
+        self.nodes_visited += other.nodes_visited
+        self.trie_lookups += other.trie_lookups
+        self.dead_ends += other.dead_ends
+        self.words_found += other.words_found
+        self.max_depth = max(self.max_depth, other.max_depth)
+
+    def to_dict(self):
+        """Get the stats as a dict, for JSON."""
+        return dict(nodes_visited=self.nodes_visited, trie_lookups=self.trie_lookups, dead_ends=self.dead_ends,
+                    max_depth=self.max_depth, words_found=self.words_found, timings=dict(self.timings))
+
+    def __str__(self):
+        lines = ["%s: %s" % (name, value) for name, value in sorted(self.to_dict().items()) if name != 'timings']
+        lines.extend("%s time: %.6f seconds" % (phase, seconds) for phase, seconds in sorted(self.timings.items()))
+        return "\n".join(lines)
 
 
 class SolveBoggle:
@@ -40,40 +152,464 @@ class SolveBoggle:
         else:
             self.boggle.generate_boggle_board()
 
-    def solve(self, edict, ignore_indexes=None, normal_adj=True, adjacency_funct=get_standard_boggle_adjacent):
+    def solve(self, edict, ignore_indexes=None, normal_adj=True, adjacency_funct=get_standard_boggle_adjacent,
+              workers=None, prune=False, stats=None):
         """
         Solve the boggle board, or get all words for scrabble.
 
         :param bool normal_adj: True to solve for boggle.
                                 False to solve for scrabble.
+        :param adjacency_funct: adjacency function the neighbor table is built from.
+        :param workers: number of processes to split the starting indexes between (optional).
+            Only worth it for large boards. Where fork is available the workers share edict.
+        :type workers: int or None
+        :param bool prune: search a cached dictionary of only the words the board's letters can spell.
+            Only worth it when boards with the same letters are solved repeatedly.
+        :param stats: filled in with counts and phase timings of the solve (optional).
+            A solve with stats runs the instrumented search, which is slower while it is counting.
+        :type stats: SolveStats or None
         :returns: sorted list of all words found.
         """
         if ignore_indexes is None:
             ignore_indexes = []
         assert self.boggle.is_full(), "Boggle board has not been set."
+        if prune:
+            start = time.time()
+            edict = prune_dictionary(edict, self.boggle.boggle_array)
+            if stats is not None:
+                stats.add_time('prune', time.time() - start)
         words = set()
-        for i, letter in enumerate(self.boggle.boggle_array):
+        start_indexes = range(0, len(self.boggle.boggle_array))
+        start = time.time()
+        neighbors = get_neighbor_table(adjacency_funct, self.boggle.num_columns, self.boggle.num_rows)
+        visited = self._new_visited(ignore_indexes, adjacency_funct)
+        if stats is not None:
+            stats.add_time('neighbors', time.time() - start)
+        start = time.time()
+        if workers is None or workers <= 1:
+            self._search_from(start_indexes, edict, neighbors, visited, words, stats=stats)
+        else:
+            # more chunks than workers, interleaved, so busy areas of the board are spread out.
+            chunks = workers * 4
+            with ProcessPoolExecutor(workers, mp_context=get_pool_context(), initializer=_init_worker,
+                                     initargs=(self, edict, neighbors, visited, stats is not None)) as pool:
+                for chunk_words, chunk_stats in pool.map(_search_indexes,
+                                                         [start_indexes[i::chunks] for i in range(chunks)]):
+                    words.update(chunk_words)
+                    if stats is not None:
+                        stats.merge(chunk_stats)
+        if stats is None:
+            return sorted(words)
+
+        stats.add_time('search', time.time() - start)
+        start = time.time()
+        words = sorted(words)
+        stats.add_time('sort', time.time() - start)
+        return words
+
+    def solve_rack(self, edict, rack):
+        """
+        Get all words for a scrabble rack, without a board.
+
+        Finds the same words as solving the rack's letters with get_scrabble_adjacent,
+            without trying every ordering of them, and can also have blank tiles.
+
+        :param edict: dictionary to solve against.
+        :param rack: the letters, as text with ? for each blank tile, or a list of letters.
+        :returns: sorted list of all words found.
+        """
+        return solve_rack(edict, rack, self.min_word_len)
+
+    def iter_words(self, edict, ignore_indexes=None, adjacency_funct=get_standard_boggle_adjacent, prune=False):
+        """
+        Solve the boggle board, yielding each word as soon as it is found.
+
+        Words come out in the order they are found, each only once.
+        The first words of even a very large board come out in milliseconds.
+
+        :param edict: dictionary to solve against.
+        :param list ignore_indexes: indexes that can't be used in any word (optional).
+        :param adjacency_funct: adjacency function the neighbor table is built from.
+        :param bool prune: search a cached dictionary of only the words the board's letters can spell.
+        :yields: each word found.
+        """
+        assert self.boggle.is_full(), "Boggle board has not been set."
+        if prune:
+            edict = prune_dictionary(edict, self.boggle.boggle_array)
+        neighbors = get_neighbor_table(adjacency_funct, self.boggle.num_columns, self.boggle.num_rows)
+        visited = self._new_visited(ignore_indexes or [], adjacency_funct)
+        boggle_array = self.boggle.boggle_array
+        found = set()
+        for i, letter in enumerate(boggle_array):
+            if visited[i]:
+                continue
             node = edict.get_last_node(edict.dictionary_root, letter)
-            if i not in ignore_indexes and node is not None:
-                self.recurse_search_for_words(i, edict, node, ignore_indexes + [i], adjacency_funct, words)
-        return sorted(words)
+            if node is not None:
+                visited[i] = 1
+                for word in self.generate_words(i, edict, node, visited, neighbors, [letter]):
+                    if word not in found:
+                        found.add(word)
+                        yield word
+                visited[i] = 0
+
+    def solve_paths(self, edict, ignore_indexes=None, adjacency_funct=get_standard_boggle_adjacent, all_paths=False):
+        """
+        Solve the boggle board, getting the board indexes each word is spelled along.
+
+        Paths are arrays of the smallest typecode that fits the board (see path_typecode),
+            one byte per letter for boards up to 16x16.
+
+        :param edict: dictionary to solve against.
+        :param list ignore_indexes: indexes that can't be used in any word (optional).
+        :param adjacency_funct: adjacency function the neighbor table is built from.
+        :param bool all_paths: get every path that spells each word, not just the first found.
+        :returns: dict of word: array of indexes. With all_paths, word: list of arrays.
+        """
+        assert self.boggle.is_full(), "Boggle board has not been set."
+        neighbors = get_neighbor_table(adjacency_funct, self.boggle.num_columns, self.boggle.num_rows)
+        visited = self._new_visited(ignore_indexes or [], adjacency_funct)
+        boggle_array = self.boggle.boggle_array
+        typecode = path_typecode(len(boggle_array))
+        paths = {}
+        for i, letter in enumerate(boggle_array):
+            if visited[i]:
+                continue
+            node = edict.get_last_node(edict.dictionary_root, letter)
+            if node is not None:
+                visited[i] = 1
+                for word, path in self.generate_paths(i, edict, node, visited, neighbors, [letter],
+                                                      array(typecode, [i])):
+                    if all_paths:
+                        paths.setdefault(word, []).append(path[:])
+                    elif word not in paths:
+                        paths[word] = path[:]
+                visited[i] = 0
+        return paths
+
+    def _search_from(self, start_indexes, edict, neighbors, visited, words, stats=None):
+        """
+        Search for all words starting at the given indexes.
 
-    def recurse_search_for_words(self, a_index, edict, node,
-                                 indexes_searched, adjacency_funct, words=set()):
+        :param start_indexes: indexes words can start at.
+        :param tuple neighbors: neighbor table from get_neighbor_table.
+        :param bytearray visited: 1 for each ignored index, the same again when the search returns.
+        :param set words: set to add the words found to.
+        :param stats: count what the search does, using the instrumented search (optional).
+        :type stats: SolveStats or None
+        """
+        if stats is not None:
+            def search(*args):
+                self.instrumented_search_for_words(*args, stats=stats)
+        else:
+            search = self.search_for_words
+        boggle_array = self.boggle.boggle_array
+        for i in start_indexes:
+            if visited[i]:
+                continue
+            node = edict.get_last_node(edict.dictionary_root, boggle_array[i])
+            if stats is not None:
+                stats.trie_lookups += 1
+                stats.dead_ends += node is None
+            if node is not None:
+                visited[i] = 1
+                search(i, edict, node, visited, neighbors, words, [boggle_array[i]])
+                visited[i] = 0
+
+    def _new_visited(self, ignore_indexes, adjacency_funct=None):
+        """
+        Make the visited flags for a search.
+
+        :param list ignore_indexes: indexes that can't be used in any word.
+        :param adjacency_funct: adjacency function, whose holes can't be used either (optional).
+        :returns: bytearray with a 1 for every ignored index.
+        """
+        visited = bytearray(len(self.boggle.boggle_array))
+        for index in ignore_indexes:
+            visited[index] = 1
+        for index in get_holes(adjacency_funct):
+            visited[index] = 1
+        return visited
+
+    def search_for_words(self, a_index, edict, node, visited, neighbors, words, path):
         """
         Recursively search boggle board for words.
 
+        The search solves without stats run, so it does nothing but search.
+        The word is rebuilt from the letters along the path,
+            so any dictionary with the Edict node interface can be searched.
+        visited and path are updated in place and restored before returning,
+            so no bookkeeping is allocated per step.
+        Paths longer than RECURSION_DEPTH go on with generate_words' explicit stack.
+
         :param int a_index: current board index.
-        :param indexes_searched: indexes searched already.
-        :type indexes_searched: None or list.
-        :param bool normal_adj: whether to solve for boggle or scrabble.
+        :param bytearray visited: 1 for each index on the path or ignored.
+        :param tuple neighbors: neighbor table from get_neighbor_table.
+        :param set words: words found so far.
+        :param list path: letters spelled so far, ending at node.
         """
-        if node.word and (len(node.word) >= self.min_word_len):
-            words.add(node.word)
-        if not node.letters.keys():
+        if edict.is_terminal(node):
+            word = ''.join(path)
+            if len(word) >= self.min_word_len:
+                words.add(word)
+        if not edict.has_children(node):
             return
-        for index in adjacency_funct(a_index, self.boggle.num_columns, self.boggle.num_rows, indexes_searched):
-            new_node = edict.get_last_node(node, self.boggle.boggle_array[index])
+        if len(path) >= RECURSION_DEPTH:
+            words.update(self.generate_words(a_index, edict, node, visited, neighbors, path))
+            return
+        boggle_array = self.boggle.boggle_array
+        for index in neighbors[a_index]:
+            if visited[index]:
+                continue
+            letter = boggle_array[index]
+            new_node = edict.get_last_node(node, letter)
             if new_node is not None:
-                self.recurse_search_for_words(index, edict, new_node, indexes_searched + [index],
-                                              adjacency_funct, words)
+                visited[index] = 1
+                path.append(letter)
+                self.search_for_words(index, edict, new_node, visited, neighbors, words, path)
+                path.pop()
+                visited[index] = 0
+
+    def instrumented_search_for_words(self, a_index, edict, node, visited, neighbors, words, path, stats):
+        """
+        Search boggle board for words using an explicit stack, counting what the search does.
+
+        The same search as search_for_words,
+            kept separate so solves that aren't instrumented don't pay for the counting.
+
+        :param int a_index: starting board index.
+        :param bytearray visited: 1 for each index on the path or ignored.
+        :param tuple neighbors: neighbor table from get_neighbor_table.
+        :param set words: words found so far.
+        :param list path: letters spelled so far, ending at node.
+        :param SolveStats stats: counts to add to.
+        """
+        boggle_array = self.boggle.boggle_array
+        min_word_len = self.min_word_len
+
+        stats.nodes_visited += 1
+        stats.max_depth = max(stats.max_depth, len(path))
+        if edict.is_terminal(node):
+            word = ''.join(path)
+            if len(word) >= min_word_len:
+                words.add(word)
+                stats.words_found += 1
+        if not edict.has_children(node):
+            return
+        stack = [(a_index, node, iter(neighbors[a_index]))]
+        while stack:
+            a_index, node, adjacent = stack[-1]
+            for index in adjacent:
+                if visited[index]:
+                    continue
+                letter = boggle_array[index]
+                new_node = edict.get_last_node(node, letter)
+                stats.trie_lookups += 1
+                if new_node is None:
+                    stats.dead_ends += 1
+                    continue
+                path.append(letter)
+                stats.nodes_visited += 1
+                stats.max_depth = max(stats.max_depth, len(path))
+                if edict.is_terminal(new_node):
+                    word = ''.join(path)
+                    if len(word) >= min_word_len:
+                        words.add(word)
+                        stats.words_found += 1
+                if edict.has_children(new_node):
+                    visited[index] = 1
+                    stack.append((index, new_node, iter(neighbors[index])))
+                    break
+                path.pop()
+            else:
+                # every adjacent index has been tried, step back. The start index belongs to the caller.
+                stack.pop()
+                if stack:
+                    visited[a_index] = 0
+                    path.pop()
+
+    def generate_words(self, a_index, edict, node, visited, neighbors, path):
+        """
+        Search boggle board for words using an explicit stack, yielding them as they are found.
+
+        :param int a_index: starting board index.
+        :param bytearray visited: 1 for each index on the path or ignored.
+        :param tuple neighbors: neighbor table from get_neighbor_table.
+        :param list path: letters spelled so far, ending at node.
+        :returns: iterator of each word found, once for every path that spells it.
+        """
+        return map(itemgetter(0), self.generate_paths(a_index, edict, node, visited, neighbors, path))
+
+    def generate_paths(self, a_index, edict, node, visited, neighbors, path, indexes=None):
+        """
+        Search boggle board for words using an explicit stack, yielding them as they are found.
+
+        The search for streaming words and getting their paths.
+        Each stack frame is the board index, the dictionary node reached there,
+            and the iterator over the adjacent indexes still to try.
+        visited, path and indexes are only restored once the generator is exhausted.
+
+        :param int a_index: starting board index.
+        :param bytearray visited: 1 for each index on the path or ignored.
+        :param tuple neighbors: neighbor table from get_neighbor_table.
+        :param list path: letters spelled so far, ending at node.
+        :param indexes: board indexes of the letters in path, to keep up to date (optional).
+            It is updated in place, so copy it to keep a path.
+        :type indexes: array or None
+        :yields: tuple of each word found and indexes, once for every path that spells it.
+        """
+        boggle_array = self.boggle.boggle_array
+        min_word_len = self.min_word_len
+        get_last_node = edict.get_last_node
+        is_terminal = edict.is_terminal
+        has_children = edict.has_children
+        track = indexes is not None
+
+        if is_terminal(node):
+            word = ''.join(path)
+            if len(word) >= min_word_len:
+                yield word, indexes
+        if not has_children(node):
+            return
+        stack = [(a_index, node, iter(neighbors[a_index]))]
+        while stack:
+            a_index, node, adjacent = stack[-1]
+            for index in adjacent:
+                if visited[index]:
+                    continue
+                letter = boggle_array[index]
+                new_node = get_last_node(node, letter)
+                if new_node is None:
+                    continue
+                # follow the letter.
+                path.append(letter)
+                if track:
+                    indexes.append(index)
+                if is_terminal(new_node):
+                    word = ''.join(path)
+                    if len(word) >= min_word_len:
+                        yield word, indexes
+                # go on from its neighbors, or step back off it if no word continues past it.
+                if has_children(new_node):
+                    visited[index] = 1
+                    stack.append((index, new_node, iter(neighbors[index])))
+                    break
+                if track:
+                    indexes.pop()
+                path.pop()
+            else:
+                # every adjacent index has been tried, step back. The start index belongs to the caller.
+                stack.pop()
+                if stack:
+                    visited[a_index] = 0
+                    if track:
+                        indexes.pop()
+                    path.pop()
+
+
+class BatchStats:
+
+    """Throughput of a solve_many call, updated as boards are solved."""
+
+    def __init__(self):
+        self.boards = 0
+        self.seconds = 0.0
+
+    @property
+    def boards_per_second(self):
+        """Boards solved per second so far."""
+        return self.boards / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return "%s boards in %.3f seconds (%.1f boards/sec)" % (self.boards, self.seconds, self.boards_per_second)
+
+
+def _init_batch_worker(edict, columns, rows, min_word_len, adjacency_funct):
+    _worker_state['batch'] = BatchSolver(edict, columns, rows, min_word_len, adjacency_funct)
+
+
+def _solve_batch_board(board):
+    return _worker_state['batch'].solve(board)
+
+
+class BatchSolver:
+
+    """
+    Solves boards of one size, reusing the solver, neighbor table and visited flags.
+
+    For callers that solve one board at a time in a loop, where solve_many's generator doesn't fit.
+    """
+
+    def __init__(self, edict, columns=4, rows=4, min_word_len=3, adjacency_funct=get_standard_boggle_adjacent):
+        """
+        Build the neighbor table once for every board to be solved.
+
+        :param edict: dictionary to solve against.
+        :param int columns: number of columns in every board.
+        :param int rows: number of rows in every board.
+        :param int min_word_len: shortest word to include.
+        :param adjacency_funct: adjacency function the neighbor table is built from.
+        """
+        self.edict = edict
+        self.solver = SolveBoggle()
+        self.solver.min_word_len = min_word_len
+        self.solver.boggle.num_columns = columns
+        self.solver.boggle.num_rows = rows
+        self.start_indexes = range(0, columns * rows)
+        self.neighbors = get_neighbor_table(adjacency_funct, columns, rows)
+        self.visited = bytearray(columns * rows)
+        for index in get_holes(adjacency_funct):
+            self.visited[index] = 1
+
+    def solve(self, board):
+        """
+        Solve one board.
+
+        :param board: list of letters or a string with one letter per index.
+        :returns: sorted list of all words found.
+        """
+        assert len(board) == len(self.visited), "Board %r is not %s letters." % (board, len(self.visited))
+        self.solver.boggle.set_array(board)
+        words = set()
+        self.solver._search_from(self.start_indexes, self.edict, self.neighbors, self.visited, words)
+        return sorted(words)
+
+
+def solve_many(boards, edict, columns=4, rows=4, min_word_len=3, adjacency_funct=get_standard_boggle_adjacent,
+               workers=None, chunk_size=64, stats=None):
+    """
+    Solve many boards of the same size against one dictionary.
+
+    Results are generated in the same order as the boards, as soon as they are solved.
+
+    :param boards: iterable of boards, each a list of letters or a string with one letter per index.
+    :param edict: dictionary to solve against.
+    :param int columns: number of columns in every board.
+    :param int rows: number of rows in every board.
+    :param int min_word_len: shortest word to include.
+    :param adjacency_funct: adjacency function the neighbor table is built from.
+    :param workers: number of processes to solve boards in (optional).
+    :type workers: int or None
+    :param int chunk_size: boards sent to a worker at a time.
+    :param stats: updated with the boards solved and time taken (optional).
+    :type stats: BatchStats or None
+    :yields: sorted list of all words found, for each board.
+    """
+    if stats is None:
+        stats = BatchStats()
+    start = time.time()
+    if workers is None or workers <= 1:
+        batch_solver = BatchSolver(edict, columns, rows, min_word_len, adjacency_funct)
+        results = (batch_solver.solve(board) for board in boards)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(workers, mp_context=get_pool_context(), initializer=_init_batch_worker,
+                                   initargs=(edict, columns, rows, min_word_len, adjacency_funct))
+        results = pool.map(_solve_batch_board, boards, chunksize=chunk_size)
+    try:
+        for words in results:
+            stats.boards += 1
+            stats.seconds = time.time() - start
+            yield words
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
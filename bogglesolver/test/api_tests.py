@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+
+"""Tests for the web APIs."""
+
+
+import asyncio
+import importlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from urllib.request import urlopen
+
+from bogglesolver.load_english_dictionary import Edict
+from bogglesolver.compiled_dictionary import compile_dictionary
+from bogglesolver.solution_cache import SolutionCache
+
+try:
+    import flask
+    import flask_restful
+except ImportError:
+    flask = None
+
+# the api directory is not a package that gets installed, it is run from the repository.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+async_api = importlib.import_module("api.async_api")
+serve = importlib.import_module("api.serve")
+
+
+def make_dictionary():
+    """Get the test words, with words for the test boards."""
+    edict = Edict()
+    edict.read_dictionary(True)
+    for word in ["wat", "ate", "tea", "eat", "quit", "quits", "suit"]:
+        edict.add_word(word)
+    # every ordering of nine a's spells these, which keeps a scrabble solve busy for a while.
+    for length in range(3, 10):
+        edict.add_word("a" * length)
+    return edict
+
+
+class TestAsyncApi(unittest.TestCase):
+
+    """Tests for the asyncio API, called directly as an ASGI application."""
+
+    def setUp(self):
+        self.saved = dict((name, getattr(async_api, name)) for name in
+                          ("edict", "cache", "WORKERS", "MAX_PENDING", "TIMEOUT", "MAX_CELLS"))
+        # set before the pool forks, so the solver processes use them too.
+        async_api.edict = make_dictionary()
+        async_api.cache = async_api.SolutionCache()
+        async_api.WORKERS = 1
+        async_api._pool = None
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        if async_api._pool is not None:
+            async_api._pool.shutdown(wait=True)
+            async_api._pool = None
+        self.loop.close()
+        for name, value in self.saved.items():
+            setattr(async_api, name, value)
+
+    def get(self, path, query=""):
+        """Get a path from the application, returns the status and the decoded body."""
+        scope = dict(type="http", method="GET", path=path, query_string=query.encode("utf-8"))
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        self.loop.run_until_complete(async_api.app(scope, receive, send))
+        assert messages[0]["type"] == "http.response.start"
+        return messages[0]["status"], json.loads(messages[1]["body"].decode("utf-8"))
+
+    def wait_for_solves(self):
+        """Run the loop until every solve sent to the pool is done."""
+        deadline = time.time() + 30
+        while async_api._pending and time.time() < deadline:
+            self.loop.run_until_complete(asyncio.sleep(0.05))
+        assert async_api._pending == 0
+
+    def test_solve(self):
+        """Test solving a board, then answering it from the cache."""
+        status, body = self.get("/1/5/water")
+        assert status == 200
+        assert body == dict(words=["ate", "wat", "water"])
+        assert async_api._pending == 0
+        assert self.get("/1/5/water")[1] == body
+        assert self.get("/cache")[1]["hits"] == 1
+
+        status, body = self.get("/2/2/[qu]its", "adjacency=toroid&length=4")
+        assert status == 200
+        assert body == dict(words=["quit", "quits"])
+
+        status, body = self.get("/1/5/water", "paths=1")
+        assert body == dict(words=["ate", "wat", "water"], paths=dict(ate=[1, 2, 3], wat=[0, 1, 2], water=[0, 1, 2, 3, 4]))
+        status, body = self.get("/1/5/water", "paths=all")
+        assert body["paths"]["water"] == [[0, 1, 2, 3, 4]]
+
+    def test_generate(self):
+        """Test generating boards."""
+        status, body = self.get("/3/2")
+        assert status == 200
+        assert body["solution"] == "/3/2/" + body["board"]
+        status, body = self.get("/", "rows=2&columns=5")
+        assert status == 200
+        assert body["solution"].startswith("/2/5/")
+        async_api.MAX_CELLS = 4
+        assert self.get("/3/2")[0] == 400
+
+    def test_bad_requests(self):
+        """Test boards and arguments that can't be solved are rejected."""
+        assert self.get("/1/5/wat")[0] == 400
+        assert self.get("/1/5/wat3r")[0] == 400
+        assert self.get("/1/3/w[at")[0] == 400
+        assert self.get("/1/5/water", "adjacency=spiral")[0] == 400
+        assert self.get("/1/5/water", "length=three")[0] == 400
+        assert self.get("/1/5/water", "paths=2")[0] == 400
+        assert self.get("/", "rows=four")[0] == 400
+        assert self.get("/1/5/water/more/path")[0] == 404
+        assert async_api._pool is None
+
+    def test_timeout(self):
+        """Test a slow solve times out, and keeps its place until it is done."""
+        async_api.TIMEOUT = 0.05
+        async_api.MAX_PENDING = 1
+        status, body = self.get("/3/3/aaaaaaaaa", "adjacency=scrabble")
+        assert status == 504
+        # the timed out solve is still running, so there is no room for another.
+        assert async_api._pending == 1
+        assert self.get("/1/5/water")[0] == 503
+
+        self.wait_for_solves()
+        async_api.TIMEOUT = 30
+        assert self.get("/1/5/water") == (200, dict(words=["ate", "wat", "water"]))
+
+    def test_overload(self):
+        """Test solves past MAX_PENDING are turned away with a 503."""
+        async_api.TIMEOUT = 30
+        async_api.MAX_PENDING = 2
+
+        async def solve_together(count):
+            return await asyncio.gather(*(async_api.route("/3/3/aaaaaaaaa", dict(adjacency=["scrabble"]))
+                                          for _ in range(count)))
+
+        statuses = sorted(status for status, body in self.loop.run_until_complete(solve_together(3)))
+        assert statuses == [200, 200, 503]
+        self.wait_for_solves()
+
+    def test_lifespan(self):
+        """Test the application starts up and shuts its pool down."""
+        assert self.get("/1/5/water")[0] == 200
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        self.loop.run_until_complete(async_api.app(dict(type="lifespan"), receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+@unittest.skipIf(flask is None, "The Flask API needs flask and flask_restful.")
+class TestFlaskApi(unittest.TestCase):
+
+    """Tests for the Flask API, called through its test client."""
+
+    @classmethod
+    def setUpClass(cls):
+        # importing the app loads its dictionary, so give it a small compiled one to map instead.
+        cls.directory = tempfile.mkdtemp()
+        path = os.path.join(cls.directory, "test.bin")
+        compile_dictionary(path, words=["wat"])
+        saved = os.environ.get("BOGGLE_DICTIONARY")
+        os.environ["BOGGLE_DICTIONARY"] = path
+        try:
+            cls.api = importlib.import_module("api.api")
+        finally:
+            if saved is None:
+                del os.environ["BOGGLE_DICTIONARY"]
+            else:
+                os.environ["BOGGLE_DICTIONARY"] = saved
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.api.edict.close()
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        self.saved = (self.api.edict, self.api.cache)
+        self.api.edict = make_dictionary()
+        self.api.cache = SolutionCache()
+        self.client = self.api.app.test_client()
+
+    def tearDown(self):
+        self.api.edict, self.api.cache = self.saved
+
+    def get(self, url):
+        """Get a url from the application, returns the status and the decoded body."""
+        response = self.client.get(url)
+        return response.status_code, json.loads(response.get_data(as_text=True))
+
+    def test_solve(self):
+        """Test solving a board, with each of the solution's arguments."""
+        assert self.get("/1/5/water") == (200, dict(words=["ate", "wat", "water"]))
+        assert self.get("/1/5/water?length=5") == (200, dict(words=["water"]))
+        assert self.get("/1/5/retaw?adjacency=scrabble&length=5")[1] == dict(words=["water"])
+        assert self.get("/2/2/[qu]its?adjacency=toroid&length=4")[1] == dict(words=["quit", "quits"])
+
+        status, body = self.get("/1/5/water?paths=1")
+        assert body == dict(words=["ate", "wat", "water"], paths=dict(ate=[1, 2, 3], wat=[0, 1, 2], water=[0, 1, 2, 3, 4]))
+        status, body = self.get("/1/5/water?paths=all")
+        assert body["paths"]["water"] == [[0, 1, 2, 3, 4]]
+
+        status, body = self.get("/1/5/water?stats=1")
+        assert body["words"] == ["ate", "wat", "water"]
+        assert body["stats"]["words_found"] >= 3
+        assert "search" in body["stats"]["timings"]
+
+    def test_cache(self):
+        """Test a solution is answered from the cache the second time."""
+        assert self.get("/cache")[1]["hits"] == 0
+        assert self.get("/1/5/water")[1] == self.get("/1/5/water")[1]
+        assert self.get("/cache")[1]["hits"] == 1
+        # a different length is a different solution.
+        self.get("/1/5/water?length=4")
+        assert self.get("/cache")[1]["hits"] == 1
+
+    def test_stream(self):
+        """Test streaming the words as newline delimited JSON."""
+        response = self.client.get("/1/5/water/stream")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert sorted(json.loads(line)["word"] for line in lines) == ["ate", "wat", "water"]
+        lines = self.client.get("/2/2/[qu]its/stream?adjacency=toroid&length=5").get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == [dict(word="quits")]
+
+    def test_generate(self):
+        """Test generating boards."""
+        status, body = self.get("/3/2")
+        assert status == 200
+        assert body["solution"].startswith("/3/2/")
+        status, body = self.get("/?rows=2&columns=5")
+        assert status == 200
+        assert body["solution"].startswith("/2/5/")
+
+    def test_bad_requests(self):
+        """Test boards and arguments that can't be solved are rejected."""
+        for url in ("/1/5/wat", "/1/5/wat3r", "/1/3/w[at", "/1/3/w[]t", "/1/5/water?adjacency=spiral",
+                    "/1/5/water?paths=2", "/1/5/wat/stream", "/1/5/water/stream?adjacency=spiral", "/?rows=four"):
+            status, body = self.get(url)
+            assert status == 400, url
+            assert body["status"] == 400
+        assert self.get("/1/5/water/more/path")[0] == 404
+
+
+class TestServe(unittest.TestCase):
+
+    """Tests for serving from forked workers."""
+
+    # a WSGI app that answers with the pid of the worker that served it.
+    SERVE_CODE = ("import os\n"
+                  "from api.serve import serve, warm_up_solver\n"
+                  "from bogglesolver.array_dictionary import ArrayEdict\n"
+                  "def app(environ, start_response):\n"
+                  "    start_response('200 OK', [('Content-Type', 'text/plain')])\n"
+                  "    return [str(os.getpid()).encode('ascii')]\n"
+                  "serve(app, '127.0.0.1', 0, 2, warm_up_solver(ArrayEdict(['wat', 'tea']), 2, 4))\n")
+
+    def test_memory_usage(self):
+        """Test the memory of this process can be read."""
+        usage = serve.memory_usage()
+        assert usage
+        assert all(size > 0 for size in usage.values())
+        if os.path.exists("/proc/self/smaps_rollup"):
+            assert set(usage) == set(["rss", "pss", "shared", "private"])
+            assert usage["shared"] + usage["private"] == usage["rss"]
+        # without smaps only the peak resident size is known.
+        assert list(serve.memory_usage(pid="no-such-process")) == ["max_rss"]
+        assert serve.format_memory(dict(rss=2048, pss=1024)) == "pss: 1.0 MB, rss: 2.0 MB"
+
+    def read_line(self, server, expected):
+        line = server.stdout.readline()
+        assert expected in line, line
+        return line
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Serving forks the workers.")
+    def test_workers(self):
+        """Test the workers warm up and serve, a dead worker is replaced, and SIGTERM stops them all."""
+        server = subprocess.Popen([sys.executable, "-u", "-c", self.SERVE_CODE], cwd=ROOT,
+                                  stdout=subprocess.PIPE, universal_newlines=True)
+        try:
+            self.read_line(server, "App loaded")
+            lines = [server.stdout.readline() for _ in range(5)]
+            url = [line.split()[2] for line in lines if line.startswith("Serving on")][0]
+            workers = set(int(line.split()[1]) for line in lines if line.startswith("Worker"))
+            assert len(workers) == 2
+            warmed = [line for line in lines if "warmed up" in line]
+            assert set(int(line.split()[1]) for line in warmed) == workers
+            assert all("rss" in line for line in warmed)
+
+            assert int(urlopen(url).read()) in workers
+            dead = workers.pop()
+            os.kill(dead, signal.SIGKILL)
+            self.read_line(server, "Worker %s exited" % dead)
+            replacement = int(self.read_line(server, "started").split()[1])
+            assert replacement != dead
+            self.read_line(server, "Worker %s warmed up" % replacement)
+            workers.add(replacement)
+            for _ in range(4):
+                assert int(urlopen(url).read()) in workers
+
+            server.send_signal(signal.SIGTERM)
+            assert server.wait(timeout=10) == 0
+            for worker in workers:
+                self.assertRaises(OSError, os.kill, worker, 0)
+        finally:
+            if server.poll() is None:
+                server.kill()
+                server.wait()
+            server.stdout.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
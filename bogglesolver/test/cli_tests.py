@@ -3,6 +3,8 @@
 """Test for the command line interface."""
 
 
+import contextlib
+import io
 import unittest
 
 from bogglesolver.cli import main
@@ -21,5 +23,15 @@ class TestCli(unittest.TestCase):
         self.assertRaises(SystemExit, main, ['--help'])
         self.assertRaises(SystemExit, main, ['-h'])
 
+    def test_main_words(self):
+        """Verify 'bogglesolver -w' lists the words for a rack."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(['-w', 'tea?', '-l', '4'])
+        lines = output.getvalue().splitlines()
+        self.assertIn("teak", lines)
+        self.assertNotIn("tea", lines)
+        self.assertEqual(lines[-1], "%s words found." % (len(lines) - 1))
+
 if __name__ == '__main__':
     unittest.main()
@@ -11,6 +11,8 @@ import sqlite3
 import os
 
 from bogglesolver.load_english_dictionary import Edict
+from bogglesolver.array_dictionary import ArrayEdict
+from bogglesolver.compiled_dictionary import MappedEdict, compile_dictionary
 from bogglesolver.boggle_board import Boggle
 from bogglesolver.solve_boggle import SolveBoggle
 from bogglesolver.adjacency import *
@@ -128,6 +130,85 @@ class test_everything(unittest.TestCase):
             assert my_dict.is_word(line.lower())
 
 
+class test_array_dictionary(unittest.TestCase):
+
+    """Integration tests for the array dictionary."""
+
+    def test_matches_edict(self):
+        """Test that the array dictionary solves boards the same as the Edict."""
+        array_dict = ArrayEdict()
+        array_dict.read_dictionary()
+        for word in WORD_LIST:
+            assert array_dict.is_word(word)
+
+        edict = Edict()
+        edict.read_dictionary()
+        solve_game = SolveBoggle()
+        for i in range(3):
+            solve_game.set_board(10, 10)
+            assert solve_game.solve(array_dict) == solve_game.solve(edict)
+            solve_game.set_board(5, 5)
+            assert solve_game.solve(array_dict, adjacency_funct=get_toroid_boggle_adjacent) == \
+                solve_game.solve(edict, adjacency_funct=get_toroid_boggle_adjacent)
+
+    def test_dawg_matches_edict(self):
+        """Test that the DAWG is smaller and solves boards the same as the Edict."""
+        trie = ArrayEdict(WORD_LIST)
+        dawg = ArrayEdict(WORD_LIST, minimize=True)
+        print("Trie nodes: %s, DAWG nodes: %s" % (trie.node_count, dawg.node_count))
+        assert dawg.node_count * 4 < trie.node_count
+        assert dawg.get_words(dawg.dictionary_root) == sorted(WORD_LIST)
+
+        edict = Edict()
+        edict.read_dictionary()
+        solve_game = SolveBoggle()
+        for i in range(3):
+            solve_game.set_board(10, 10)
+            assert solve_game.solve(dawg) == solve_game.solve(edict)
+
+
+class test_pruned_dictionary(unittest.TestCase):
+
+    """Integration tests for pruning the dictionary per board."""
+
+    def test_matches_full_dictionary(self):
+        """Test that pruned dictionaries solve boards the same as the full one."""
+        edict = Edict()
+        edict.read_dictionary()
+        solve_game = SolveBoggle()
+        for i in range(5):
+            solve_game.set_board(4, 4)
+            assert solve_game.solve(edict, prune=True) == solve_game.solve(edict)
+
+
+class test_compiled_dictionary(unittest.TestCase):
+
+    """Integration tests for the compiled dictionary."""
+
+    def test_matches_edict(self):
+        """Test that the compiled dictionary solves boards the same as the Edict."""
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'twl06_test.bin')
+        compile_dictionary(path, minimize=True)
+        try:
+            t0 = time.time()
+            mapped = MappedEdict(path)
+            t1 = time.time()
+            print("Opened compiled dictionary in %s seconds." % (t1 - t0))
+            assert t1 - t0 < 1
+
+            for word in WORD_LIST:
+                assert mapped.is_word(word)
+
+            edict = Edict()
+            edict.read_dictionary()
+            solve_game = SolveBoggle()
+            solve_game.set_board(10, 10)
+            assert solve_game.solve(mapped) == solve_game.solve(edict)
+            mapped.close()
+        finally:
+            os.remove(path)
+
+
 class test_speed_against_other_libraries(unittest.TestCase):
 
     """Test my boggle library against other boggle libraries."""
@@ -3,16 +3,66 @@
 """Unit tests for all boggle classes."""
 
 
+import gc
+import itertools
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+import weakref
 
 from bogglesolver.load_english_dictionary import Edict
-from bogglesolver.boggle_board import Boggle
-from bogglesolver.solve_boggle import SolveBoggle
+from bogglesolver.array_dictionary import ArrayEdict
+from bogglesolver.compiled_dictionary import MappedEdict, compile_dictionary, default_dictionary_path, \
+    load_compiled_dictionary
+from bogglesolver.boggle_board import Boggle, BOGGLE_DICE, BIG_BOGGLE_DICE, LETTERS, parse_board, format_board
+from bogglesolver.solve_boggle import SolveBoggle, SolveStats, BatchSolver, BatchStats, solve_many, path_typecode
+from bogglesolver.pruning import prune_dictionary, spellable_words
+from bogglesolver.rack import parse_rack, rack_words, solve_rack
+from bogglesolver.solution_cache import SolutionCache
+from bogglesolver.incremental import IncrementalSolver
+from bogglesolver.bounds import upper_bound, best_boards, BoundStats
+from bogglesolver.optimizer import anneal, optimize_board
+from bogglesolver.scoring import Scorer, BOGGLE_SCORER, SCRABBLE_SCORER, BIG_BOGGLE_POINTS, SCORE_TYPECODE, get_scorer
+from bogglesolver import bench
+import bogglesolver.adjacency
 from bogglesolver.adjacency import *
+from bogglesolver.topology import Topology, STANDARD, TOROID, CYLINDER, HEX, KNIGHT, KING_MOVES, KNIGHT_MOVES, cube
 
 from bogglesolver.twl06 import TEST_WORD_LIST
 
 
+class test_import_cost(unittest.TestCase):
+
+    """Tests that importing the package stays cheap."""
+
+    IMPORT_BUDGET = 1.0
+
+    def test_import_does_not_load_word_list(self):
+        """Test importing and constructing the board doesn't import the word list."""
+        code = ("import sys, time\n"
+                "start = time.time()\n"
+                "import bogglesolver.cli\n"
+                "from bogglesolver.boggle_board import Boggle\n"
+                "from bogglesolver.solve_boggle import SolveBoggle\n"
+                "SolveBoggle()\n"
+                "try:\n"
+                "    bogglesolver.cli.main(['--help'])\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print(time.time() - start)\n"
+                "print('bogglesolver.twl06' in sys.modules)\n")
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=root).decode().split()
+        print("Import took %s seconds." % output[-2])
+        assert output[-1] == "False"
+        assert float(output[-2]) < self.IMPORT_BUDGET
+
+
 class test_boggle_letters(unittest.TestCase):
 
     """Unit tests for adding letters to the boggle board."""
@@ -24,6 +74,22 @@ class test_boggle_letters(unittest.TestCase):
         game.boggle_array = ['A'] * 4 + ['B'] * 4 + ['C'] * 4 + ['D'] * 4
         assert str(game) == " | A | A | A | A |\n | B | B | B | B |\n | C | C | C | C |\n | D | D | D | D |\n"
 
+    def test_str_multi_letter(self):
+        """Test faces of several letters keep the columns lined up."""
+        game = Boggle(2, 2)
+        game.set_array(["a", "qu", "t", "e"])
+        assert str(game) == " | a  | qu |\n | t  | e  |\n"
+
+    def test_parse_board(self):
+        """Test faces of several letters are written in brackets."""
+        assert parse_board("ab[qu]d") == ["a", "b", "qu", "d"]
+        assert parse_board("AB[Qu]D") == ["a", "b", "qu", "d"]
+        assert parse_board("") == []
+        assert format_board(["a", "b", "qu", "d"]) == "ab[qu]d"
+        assert parse_board(format_board(["th", "e", "in", "qu"])) == ["th", "e", "in", "qu"]
+        for text in ("ab[qu", "a[]b", "a1b", "ab]"):
+            self.assertRaises(ValueError, parse_board, text)
+
     def test_insert_index(self):
         """Test inserting a character into the boggle array."""
         game = Boggle(4, 4)
@@ -42,6 +108,33 @@ class test_boggle_letters(unittest.TestCase):
             game.insert('A', i)
         assert game.is_full()
 
+    def test_generate_seeded(self):
+        """Test that a seed generates the same board."""
+        game = Boggle(5, 6)
+        game.generate_boggle_board(seed=7)
+        assert game.is_full()
+        first = game.boggle_array
+        assert all(letter in LETTERS for letter in first)
+        game.generate_boggle_board(seed=7)
+        assert game.boggle_array == first
+        game.generate_boggle_board(seed=8)
+        assert game.boggle_array != first
+
+    def test_generate_dice(self):
+        """Test that dice boards use one face of each die."""
+        dice = [("a", "b"), ("c", "d"), ("e", "f"), ("g", "h")]
+        game = Boggle(2, 2)
+        game.generate_boggle_board(seed=1, dice=dice)
+        assert game.is_full()
+        assert sorted(die for die in dice for letter in game.boggle_array if letter in die) == sorted(dice)
+
+        game = Boggle(4, 4)
+        game.generate_boggle_board(dice=BOGGLE_DICE)
+        assert game.is_full()
+        game = Boggle(6, 6)
+        game.generate_boggle_board(dice=BIG_BOGGLE_DICE)
+        assert game.is_full()
+
     def test_boggle_set_array(self):
         """Test that the boggle array can be set."""
         game = Boggle(4, 4)
@@ -101,6 +194,608 @@ class test_dictionary(unittest.TestCase):
         assert my_dict.get_last_node(my_dict.dictionary_root.letters['o'], 'b') is None
 
 
+class test_array_dictionary(unittest.TestCase):
+
+    """Unit tests for the array backed dictionary."""
+
+    def test_add_word(self):
+        """Test adding words to the array dictionary."""
+        my_dict = ArrayEdict()
+        assert not my_dict.is_word("hi")
+        my_dict.add_word("HI")
+        my_dict.add_words(["he", "hell", "hello"])
+        assert my_dict.is_word("hi")
+        assert my_dict.is_word("hello")
+        assert not my_dict.is_word("hel")
+        assert my_dict.get_words(my_dict.dictionary_root) == ["he", "hell", "hello", "hi"]
+
+    def test_read_dictionary(self):
+        """Test that the array dictionary matches the Edict."""
+        my_dict = ArrayEdict()
+        my_dict.read_dictionary(True)
+        edict = Edict()
+        edict.read_dictionary(True)
+        assert my_dict.get_words(my_dict.dictionary_root) == sorted(edict.get_words(edict.dictionary_root, []))
+        # called like Edict.get_words, the words found so far are added to.
+        all_words = ["zebra", "water"]
+        assert my_dict.get_words(my_dict.dictionary_root, all_words) is all_words
+        assert all_words == ["zebra", "water"] + [word for word in sorted(TEST_WORD_LIST) if word != "water"]
+        node = my_dict.get_last_node(my_dict.dictionary_root, 'wa')
+        assert my_dict.get_words(node, [], 'wa') == ['water']
+        node = my_dict.get_last_node(my_dict.dictionary_root, 'o')
+        assert node is not None
+        assert my_dict.get_last_node(node, 'b') is None
+
+    def test_solve(self):
+        """Test solving a board with the array dictionary."""
+        my_dict = ArrayEdict(["wat", "water", "tea", "ate"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(5, 1, ["w", "a", "t", "e", "r"])
+        assert solve_game.solve(my_dict) == ["ate", "wat", "water"]
+
+    def test_non_ascii(self):
+        """Test that only ascii words can be stored."""
+        self.assertRaises(ValueError, ArrayEdict, [u"caf\xe9"])
+        self.assertRaises(ValueError, ArrayEdict, [u"caf\xe9"], True)
+
+    def test_dawg(self):
+        """Test that the DAWG shares endings and still holds the same words."""
+        words = ["cat", "cats", "bat", "bats", "rat", "rats", "rating", "bating"]
+        trie = ArrayEdict(words)
+        dawg = ArrayEdict(words, minimize=True)
+        assert dawg.node_count < trie.node_count
+        assert dawg.get_words(dawg.dictionary_root) == sorted(words)
+        for word in words:
+            assert dawg.is_word(word)
+        assert not dawg.is_word("ca")
+        assert not dawg.is_word("cating")
+        dawg.add_word("ratings")
+        assert dawg.minimize
+        assert dawg.is_word("ratings")
+        assert not dawg.is_word("batings")
+
+    def test_dawg_solve(self):
+        """Test that solving with the DAWG finds the same words as the trie."""
+        edict = Edict()
+        edict.read_dictionary(True)
+        dawg = ArrayEdict(minimize=True)
+        dawg.read_dictionary(True)
+        solve_game = SolveBoggle()
+        solve_game.min_word_len = 0
+        for array in (["w", "a", "t", "e", "r"], ["wa", "t", "er", "x", "y"]):
+            solve_game.set_board(5, 1, array)
+            assert solve_game.solve(dawg) == solve_game.solve(edict)
+            assert solve_game.solve(dawg, adjacency_funct=get_scrabble_adjacent) == \
+                solve_game.solve(edict, adjacency_funct=get_scrabble_adjacent)
+
+
+class test_compiled_dictionary(unittest.TestCase):
+
+    """Unit tests for the memory mapped dictionary."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.bin')
+        compile_dictionary(self.path, use_test_words=True)
+        self.edict = MappedEdict(self.path)
+
+    def tearDown(self):
+        self.edict.close()
+        shutil.rmtree(self.directory)
+
+    def test_is_word(self):
+        """Test looking words up in the compiled dictionary."""
+        for word in TEST_WORD_LIST:
+            assert self.edict.is_word(word)
+            assert self.edict.is_word(word.upper())
+        assert not self.edict.is_word("wat")
+        assert not self.edict.is_word("waters")
+        assert not self.edict.is_word("")
+
+    def test_get_words(self):
+        """Test getting words out of the compiled dictionary."""
+        assert self.edict.get_words(self.edict.dictionary_root) == sorted(TEST_WORD_LIST)
+        node = self.edict.get_last_node(self.edict.dictionary_root, 'wa')
+        assert self.edict.get_words(node, prefix='wa') == ['water']
+
+    def test_get_last_node(self):
+        """Test valid paths in the compiled dictionary."""
+        root = self.edict.dictionary_root
+        node = self.edict.get_last_node(root, 'o')
+        assert node is not None
+        assert self.edict.get_last_node(node, 'b') is None
+        assert self.edict.get_last_node(root, u'\xe9') is None
+        assert self.edict.has_children(node)
+        assert self.edict.is_terminal(self.edict.get_last_node(root, 'water'))
+        assert not self.edict.has_children(self.edict.get_last_node(root, 'water'))
+
+    def test_solve(self):
+        """Test solving a board with the compiled dictionary."""
+        solve_game = SolveBoggle()
+        solve_game.set_board(5, 1, ["w", "a", "t", "e", "r"])
+        assert solve_game.solve(self.edict) == ["water"]
+
+    def test_pickle(self):
+        """Test that a pickled compiled dictionary maps the same file again."""
+        copy = pickle.loads(pickle.dumps(self.edict))
+        assert copy.path == self.path
+        assert copy.get_words(copy.dictionary_root) == sorted(TEST_WORD_LIST)
+        copy.close()
+
+    def test_bad_file(self):
+        """Test that files which are not compiled dictionaries are rejected."""
+        path = os.path.join(self.directory, 'bad.bin')
+        with open(path, 'wb') as bad_file:
+            bad_file.write(b'not a dictionary' * 4)
+        self.assertRaises(ValueError, MappedEdict, path)
+
+    def test_recompile(self):
+        """Test compiling over an existing file, while it is mapped, leaves no temp files."""
+        compile_dictionary(self.path, words=["water"])
+        assert os.listdir(self.directory) == ['test.bin']
+        # the old map still reads the old file.
+        assert self.edict.get_words(self.edict.dictionary_root) == sorted(TEST_WORD_LIST)
+        edict = MappedEdict(self.path)
+        assert edict.get_words(edict.dictionary_root) == ["water"]
+        edict.close()
+
+    def test_load(self):
+        """Test the word list is compiled into the user's cache, or kept in memory if that can't be written."""
+        saved = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = self.directory
+        try:
+            path = default_dictionary_path(use_test_words=True)
+        finally:
+            if saved is None:
+                del os.environ['XDG_CACHE_HOME']
+            else:
+                os.environ['XDG_CACHE_HOME'] = saved
+        assert path == os.path.join(self.directory, 'bogglesolver', 'twl06_test.bin')
+        edict = load_compiled_dictionary(path, use_test_words=True)
+        assert isinstance(edict, MappedEdict)
+        assert edict.get_words(edict.dictionary_root) == sorted(TEST_WORD_LIST)
+        edict.close()
+
+        # a directory can't be made inside a file.
+        edict = load_compiled_dictionary(os.path.join(self.path, 'twl06_test.bin'), use_test_words=True)
+        assert isinstance(edict, ArrayEdict)
+        assert edict.get_words(edict.dictionary_root) == sorted(TEST_WORD_LIST)
+
+
+class test_pruning(unittest.TestCase):
+
+    """Unit tests for pruning the dictionary to a board's letters."""
+
+    def test_spellable_words(self):
+        """Test only words that fit the letter counts are kept."""
+        edict = ArrayEdict(["tea", "eat", "teat", "tee", "water", "quit", "qat"])
+        assert sorted(spellable_words(edict, "taeb")) == ["eat", "tea"]
+        assert sorted(spellable_words(edict, "teatb")) == ["eat", "tea", "teat"]
+        assert sorted(spellable_words(edict, ["qu", "i", "t", "a"])) == ["quit"]
+        assert spellable_words(edict, "") == []
+
+    def test_prune_dictionary(self):
+        """Test pruned dictionaries are cached by letter count."""
+        edict = ArrayEdict(["tea", "eat", "teat", "water"])
+        pruned = prune_dictionary(edict, "teab")
+        assert pruned.is_word("eat")
+        assert not pruned.is_word("water")
+        assert prune_dictionary(edict, "beta") is pruned
+        assert prune_dictionary(edict, "betat") is not pruned
+        assert prune_dictionary(ArrayEdict(["tea", "eat", "teat", "water"]), "beta") is not pruned
+
+    def test_prune_dictionary_changes(self):
+        """Test adding words drops the dictionary's pruned dictionaries."""
+        for edict in (Edict(), ArrayEdict()):
+            edict.add_word("tea")
+            assert not prune_dictionary(edict, "teab").is_word("bet")
+            edict.add_word("bet")
+            assert prune_dictionary(edict, "teab").is_word("bet")
+
+    def test_prune_dictionary_released(self):
+        """Test pruned dictionaries don't keep their dictionary alive."""
+        edict = ArrayEdict(["tea", "eat"])
+        prune_dictionary(edict, "tea")
+        reference = weakref.ref(edict)
+        del edict
+        gc.collect()
+        assert reference() is None
+
+    def test_pruned_solve(self):
+        """Test solving with a pruned dictionary finds the same words."""
+        edict = Edict()
+        edict.read_dictionary(True)
+        for word in ["wat", "ate", "tea", "eat", "rate", "tater", "waters"]:
+            edict.add_word(word)
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        for adjacency_funct in (get_standard_boggle_adjacent, get_scrabble_adjacent):
+            assert solve_game.solve(edict, adjacency_funct=adjacency_funct, prune=True) == \
+                solve_game.solve(edict, adjacency_funct=adjacency_funct)
+
+
+class test_incremental(unittest.TestCase):
+
+    """Unit tests for keeping a board solved as letters change."""
+
+    def test_max_word_length(self):
+        """Test every engine knows its longest word."""
+        words = ["tea", "eat", "teat", "waters", "ate"]
+        edict = Edict()
+        for word in words:
+            edict.add_word(word)
+        for engine in (edict, ArrayEdict(words), ArrayEdict(words, minimize=True)):
+            assert engine.max_word_length() == 6
+        assert ArrayEdict().max_word_length() == 0
+        assert Edict().max_word_length() == 0
+
+    def test_insert(self):
+        """Test the words after each insert are the words a full solve finds."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "waters", "water", "rat", "tar", "eta"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(4, 4, list("waterateratewate"))
+        solver = IncrementalSolver(solve_game.boggle, edict)
+        assert solver.words == solve_game.solve(edict)
+        for letter, index in [("x", 0), ("w", 0), ("e", 5), ("r", 15), ("t", 10), ("a", 10)]:
+            before = solver.words
+            added, removed = solver.insert(letter, index)
+            assert solver.words == solve_game.solve(edict)
+            assert added == set(solver.words) - set(before)
+            assert removed == set(before) - set(solver.words)
+
+    def test_undo(self):
+        """Test undoing an insert puts back the letter and its words."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "waters", "water", "rat", "tar", "eta"])
+        boggle = Boggle(4, 4)
+        boggle.set_array(list("waterateratewate"))
+        solver = IncrementalSolver(boggle, edict)
+        words = solver.words
+        paths = [solver.paths(word) for word in words]
+        solver.insert("x", 0)
+        assert [solver.paths(word) for word in words] != paths
+        solver.undo()
+        assert boggle.boggle_array[0] == "w"
+        assert solver.words == words
+        assert [solver.paths(word) for word in words] == paths
+        self.assertRaises(AssertionError, solver.undo)
+
+    def test_paths(self):
+        """Test paths are the board indexes that spell the word."""
+        boggle = Boggle(3, 1)
+        boggle.set_array(list("tea"))
+        solver = IncrementalSolver(boggle, ArrayEdict(["tea", "eat"]), adjacency_funct=get_scrabble_adjacent)
+        assert solver.paths("tea") == [(0, 1, 2)]
+        assert solver.paths("eat") == [(1, 2, 0)]
+        assert solver.insert("b", 0) == (set(), {"tea", "eat"})
+        assert solver.paths("tea") == []
+
+
+class test_scoring(unittest.TestCase):
+
+    """Unit tests for scoring words and boards."""
+
+    def test_boggle_points(self):
+        """Test words score by length, with long words capped at the last entry."""
+        assert [BOGGLE_SCORER.score_word("a" * length) for length in range(1, 11)] == [0, 0, 1, 1, 2, 3, 5, 11, 11, 11]
+        assert BOGGLE_SCORER.score(["tea", "teas", "water", "waters"]) == 1 + 1 + 2 + 3
+        assert BOGGLE_SCORER.score([]) == 0
+        assert Scorer(BIG_BOGGLE_POINTS).score(["tea", "teas"]) == 1
+
+    def test_letter_values(self):
+        """Test scrabble words score their letters, and tables can be combined."""
+        assert SCRABBLE_SCORER.score_word("quiz") == 10 + 1 + 1 + 10
+        assert SCRABBLE_SCORER.score_word("tea") == 3
+        assert Scorer(length_points=(0, 1), letter_values={"a": 2}).score_word("aab") == 1 + 2 + 2
+        assert get_scorer(get_scrabble_adjacent) is SCRABBLE_SCORER
+        assert get_scorer(get_standard_boggle_adjacent) is BOGGLE_SCORER
+
+    def test_score_batch(self):
+        """Test boards are scored in bulk, in order."""
+        scorer = Scorer()
+        solutions = [["tea", "water"], [], ["waters", "tea", "eat"]]
+        totals = scorer.score_batch(solutions)
+        assert list(totals) == [3, 0, 5]
+        assert list(totals) == [scorer.score(words) for words in solutions]
+        assert list(scorer.score_words(["tea", "waters"])) == [1, 3]
+        assert scorer.score_words([]).typecode == totals.typecode == SCORE_TYPECODE
+
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water"])
+        boards = ["waterater", "tatereraw"]
+        totals = scorer.score_batch(solve_many(boards, edict, columns=3, rows=3))
+        assert len(totals) == 2
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, list(boards[0]))
+        assert totals[0] == scorer.score(solve_game.solve(edict))
+
+
+class test_optimizer(unittest.TestCase):
+
+    """Unit tests for searching for high scoring boards."""
+
+    words = ["tea", "eat", "ate", "teas", "eats", "seat", "east", "sate", "rate", "tear", "tare", "stare",
+             "tears", "rates", "treat", "water", "waters", "tater", "taters"]
+
+    def test_anneal(self):
+        """Test the best board scores what it reports, and beats where it started."""
+        edict = ArrayEdict(self.words)
+        score, board, candidates = anneal(edict, 3, 3, iterations=300, seed=1)
+        assert 1 < candidates <= 301
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, board)
+        assert score == BOGGLE_SCORER.score(solve_game.solve(edict)) > 0
+        assert anneal(edict, 3, 3, iterations=0, seed=1)[0] <= score
+        assert anneal(edict, 3, 3, iterations=300, seed=1) == (score, board, candidates)
+
+    def test_incremental(self):
+        """Test keeping the board solved incrementally finds the same boards."""
+        edict = ArrayEdict(self.words)
+        for temperature in (0, 10.0):
+            assert anneal(edict, 3, 3, iterations=200, seed=2, start_temperature=temperature) == \
+                anneal(edict, 3, 3, iterations=200, seed=2, start_temperature=temperature, incremental=True)
+
+    def test_optimize_board(self):
+        """Test the best of the restarts is returned, the same in worker processes."""
+        edict = ArrayEdict(self.words)
+        stats = BatchStats()
+        score, board = optimize_board(edict, 3, 3, iterations=100, restarts=3, seed=3, stats=stats)
+        assert stats.boards > 3
+        assert optimize_board(edict, 3, 3, iterations=100, restarts=3, seed=3, workers=2) == (score, board)
+
+
+class test_bounds(unittest.TestCase):
+
+    """Unit tests for board class bounds and branch and bound."""
+
+    words = test_optimizer.words
+    cells = [["t", "w"], ["a", "e"], "t", "e", ["a", "r"], "t", ["e", "s"], "r", "a"]
+    qu_words = ["quit", "quits", "quite", "suit", "suits", "tie", "ties", "its", "sit", "sits"]
+    qu_cells = ["qu", ["i", "e"], ["t", "s"], ["s", "i"]]
+
+    def board_scores(self, edict, cells=None, columns=3, rows=3):
+        solve_game = SolveBoggle()
+        scores = []
+        faces = [[cell] if isinstance(cell, str) else cell for cell in cells or self.cells]
+        for board in itertools.product(*faces):
+            solve_game.set_board(columns, rows, list(board))
+            scores.append((BOGGLE_SCORER.score(solve_game.solve(edict)), list(board)))
+        return scores
+
+    def test_upper_bound(self):
+        """Test no board in the class beats the bound, and a single board's bound is its score."""
+        edict = ArrayEdict(self.words)
+        scores = self.board_scores(edict)
+        assert upper_bound(edict, self.cells, 3, 3) >= max(scores)[0]
+        for score, board in scores:
+            assert upper_bound(edict, board, 3, 3) >= score
+        solve_game = SolveBoggle()
+        board = parse_board("waterater")
+        solve_game.set_board(3, 3, board)
+        assert upper_bound(edict, board, 3, 3) == BOGGLE_SCORER.score(solve_game.solve(edict)) > 0
+        assert upper_bound(edict, ["qu", "a", "t"], 3, 1) == 0
+
+    def test_qu_faces(self):
+        """Test a cell that is a string is one face, so a qu cell spells qu and not q or u."""
+        edict = ArrayEdict(self.qu_words)
+        solve_game = SolveBoggle()
+        solve_game.set_board(2, 2, parse_board("[qu]its"))
+        words = solve_game.solve(edict)
+        # suit can't be spelled with the qu face.
+        assert words == ["its", "quit", "quits", "sit"]
+        assert upper_bound(edict, parse_board("[qu]its"), 2, 2) == BOGGLE_SCORER.score(words) == 5
+        assert upper_bound(edict, [["qu"], "i", "t", "s"], 2, 2) == 5
+        scores = self.board_scores(edict, self.qu_cells, 2, 2)
+        assert upper_bound(edict, self.qu_cells, 2, 2) >= max(scores)[0] > 0
+        found = list(best_boards(edict, self.qu_cells, 2, 2, min_score=1, keep_best=False))
+        assert sorted(found) == sorted((score, board) for score, board in scores if score > 0)
+        assert all(board[0] == "qu" for score, board in found)
+
+    def test_best_boards(self):
+        """Test branch and bound finds the best board, and every board over a score."""
+        edict = ArrayEdict(self.words)
+        scores = self.board_scores(edict)
+        stats = BoundStats()
+        found = list(best_boards(edict, self.cells, 3, 3, stats=stats))
+        assert found[-1][0] == max(scores)[0]
+        assert [score for score, board in found] == sorted(score for score, board in found)
+        assert stats.boards_solved < len(scores)
+        assert stats.pruned > 0
+
+        min_score = sorted(score for score, board in scores)[-5]
+        found = list(best_boards(edict, self.cells, 3, 3, min_score=min_score, keep_best=False))
+        assert sorted(found) == sorted((score, board) for score, board in scores if score >= min_score)
+
+
+class test_rack(unittest.TestCase):
+
+    """Unit tests for solving scrabble racks."""
+
+    words = ["tea", "eat", "ate", "teat", "tee", "water", "waters", "quit", "quite", "zap", "at"]
+
+    def test_iter_children(self):
+        """Test every engine lists the letters after a node."""
+        edict = Edict()
+        for word in self.words:
+            edict.add_word(word)
+        for engine in (edict, ArrayEdict(self.words), ArrayEdict(self.words, minimize=True)):
+            node = engine.get_last_node(engine.dictionary_root, "t")
+            assert sorted(letter for letter, child in engine.iter_children(node)) == ["e"]
+            assert sorted(letter for letter, child in engine.iter_children(engine.dictionary_root)) == \
+                ["a", "e", "q", "t", "w", "z"]
+            for letter, child in engine.iter_children(engine.dictionary_root):
+                assert child == engine.get_last_node(engine.dictionary_root, letter)
+
+    def test_parse_rack(self):
+        """Test blanks are counted and faces of several letters are in brackets."""
+        assert parse_rack("ab?[qu]?") == (["a", "b", "qu"], 2)
+        assert parse_rack("") == ([], 0)
+        self.assertRaises(ValueError, parse_rack, "a1")
+
+    def test_solve_rack(self):
+        """Test racks find every word their letters and blanks can spell."""
+        edict = ArrayEdict(self.words)
+        assert solve_rack(edict, "teab") == ["ate", "eat", "tea"]
+        assert solve_rack(edict, "teab", min_word_len=2) == ["at", "ate", "eat", "tea"]
+        assert solve_rack(edict, "teat") == ["ate", "eat", "tea", "teat"]
+        assert solve_rack(edict, "tea?") == ["ate", "eat", "tea", "teat", "tee"]
+        assert solve_rack(edict, "??p") == ["zap"]
+        assert solve_rack(edict, ["qu", "i", "t", "e"]) == ["quit", "quite"]
+        assert solve_rack(edict, "q?ite") == ["ate", "eat", "quit", "quite", "tea", "tee"]
+        assert solve_rack(edict, "") == []
+        assert sorted(rack_words(edict, [], 3)) == ["at", "ate", "eat", "tea", "tee", "zap"]
+
+    def test_same_as_scrabble_solve(self):
+        """Test a rack finds the same words as solving its letters as a scrabble board."""
+        edict = Edict()
+        edict.read_dictionary(True)
+        for word in self.words:
+            edict.add_word(word)
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "s"])
+        assert solve_game.solve_rack(edict, "waterates") == solve_game.solve(edict, adjacency_funct=get_scrabble_adjacent)
+
+
+class test_solution_cache(unittest.TestCase):
+
+    """Unit tests for the solution cache."""
+
+    def test_lru(self):
+        """Test the least recently used solution is evicted first."""
+        cache = SolutionCache(max_size=2)
+        keys = [cache.make_key(1, 3, board, 3, get_standard_boggle_adjacent) for board in ("abc", "def", "ghi")]
+        assert len(set(keys)) == 3
+        assert cache.make_key(1, 3, "abc", 2, get_standard_boggle_adjacent) != keys[0]
+        assert cache.make_key(1, 3, "abc", 3, get_toroid_boggle_adjacent) != keys[0]
+
+        assert cache.get(keys[0]) is None
+        cache.put(keys[0], ["cab"])
+        cache.put(keys[1], ["fed"])
+        assert cache.get(keys[0]) == ["cab"]
+        cache.put(keys[2], ["hi"])
+        assert cache.get(keys[1]) is None
+        assert cache.get_or_solve(keys[0], lambda: self.fail("should be cached")) == ["cab"]
+        assert cache.get_or_solve(keys[1], lambda: ["def"]) == ["def"]
+
+        stats = cache.stats()
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+        assert stats['misses'] == 3
+        assert stats['evictions'] == 2
+        assert stats['hit_rate'] == 0.4
+
+    def test_copies(self):
+        """Test changing a solution doesn't change the cached one."""
+        cache = SolutionCache()
+        words = ["cab"]
+        cache.put("abc", words)
+        words.append("bac")
+        cached = cache.get("abc")
+        assert cached == ["cab"]
+        cached.sort(reverse=True)
+        cached.append("abc")
+        assert cache.get("abc") == ["cab"]
+
+    def test_adjacency_key(self):
+        """Test adjacency functions are keyed by where they are defined, not just their name."""
+        def get_standard_boggle_adjacent(index, num_columns, num_rows, ignore=None):
+            return iter(())
+
+        key = SolutionCache.make_key(1, 3, "abc", 3, bogglesolver.adjacency.get_standard_boggle_adjacent)
+        assert "bogglesolver.adjacency.get_standard_boggle_adjacent" in key
+        self.assertRaises(ValueError, SolutionCache.make_key, 1, 3, "abc", 3, get_standard_boggle_adjacent)
+        self.assertRaises(ValueError, SolutionCache.make_key, 1, 3, "abc", 3, lambda *args: iter(()))
+
+    def test_disk(self):
+        """Test solutions are kept in the sqlite file."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'cache.sqlite')
+            cache = SolutionCache(max_size=1, path=path, max_disk_size=2)
+            for board in ("abc", "def", "ghi"):
+                cache.put(board, [board])
+            assert cache.stats()['disk_evictions'] == 1
+            cache.close()
+
+            cache = SolutionCache(path=path)
+            assert cache.get("abc") is None
+            assert cache.get("ghi") == ["ghi"]
+            assert cache.get("ghi") == ["ghi"]
+            stats = cache.stats()
+            assert stats['disk_hits'] == 1
+            assert stats['hits'] == 1
+            assert stats['disk_size'] == 2
+            cache.close()
+        finally:
+            shutil.rmtree(directory)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Needs fork.")
+    def test_fork(self):
+        """Test a cache used before forking opens the sqlite file again in the forked process."""
+        directory = tempfile.mkdtemp()
+        try:
+            cache = SolutionCache(path=os.path.join(directory, 'cache.sqlite'))
+            cache.put("abc", ["cab"])
+            pid = os.fork()
+            if pid == 0:
+                # the forked process's memory has abc, the file is what shows it opened its own connection.
+                cache.put("def", ["fed"])
+                os._exit(0 if cache.get("abc") == ["cab"] and cache.stats()['disk_size'] == 2 else 1)
+            assert os.waitpid(pid, 0)[1] == 0
+            assert cache.get("def") == ["fed"]
+            assert cache.stats()['disk_hits'] == 1
+            cache.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+class test_bench(unittest.TestCase):
+
+    """Unit tests for the benchmark harness."""
+
+    def test_percentile(self):
+        """Test percentiles interpolate between values."""
+        assert bench.percentile([3, 1, 2], 0.5) == 2
+        assert bench.percentile([1, 2], 0.5) == 1.5
+        assert bench.percentile([5], 0.99) == 5
+        assert bench.percentile(range(101), 0.9) == 90
+
+    def test_seeded_boards(self):
+        """Test the benchmark boards are the same every time."""
+        assert bench.seeded_boards(4, 3) == bench.seeded_boards(4, 3)
+        assert len(bench.seeded_boards(5, 2)[1]) == 25
+
+    def test_run_and_compare(self):
+        """Test running the benchmark and comparing it to a baseline."""
+        directory = tempfile.mkdtemp()
+        try:
+            output = os.path.join(directory, 'bench.json')
+            assert bench.main(['-s', '3', '4', '-n', '2', '-d', 'array', '-t', '-o', output]) == 0
+            with open(output) as results_file:
+                results = json.load(results_file)
+            assert [(result['size'], result['adjacency']) for result in results['results']] == \
+                [(size, adjacency) for size in (3, 4) for adjacency in sorted(ADJACENCY)]
+            assert results['dictionary']['engine'] == 'array'
+
+            slower = json.loads(json.dumps(results))
+            for result in slower['results']:
+                result['p50'] = result['p50'] * 2 + 1
+            assert bench.compare(results, results) == []
+            assert len(bench.compare(slower, results)) == 2 * len(ADJACENCY)
+            assert bench.compare(results, slower) == []
+
+            # runs with another dictionary engine or word list aren't compared.
+            for name, value in (("engine", "edict"), ("test_words", False)):
+                other = json.loads(json.dumps(results))
+                other['dictionary'][name] = value
+                self.assertRaises(ValueError, bench.compare, results, other)
+            assert bench.main(['-s', '3', '-n', '1', '-a', 'standard', '-d', 'dawg', '-t', '-b', output]) == 2
+            # baselines saved with the old iterative setting still compare.
+            other = json.loads(json.dumps(results))
+            other['iterative'] = True
+            assert bench.compare(results, other) == []
+        finally:
+            shutil.rmtree(directory)
+
+
 class test_SolveMultiLetterBoggle(unittest.TestCase):
 
     """Unit tests for multi-letter solve game."""
@@ -141,6 +836,19 @@ class test_SolveMultiLetterBoggle(unittest.TestCase):
         assert word in words
         assert len(words) == 1
 
+    def test_qu_face(self):
+        """Test a qu face is searched as both its letters, in every engine and search."""
+        words = ["quit", "quite", "suite", "equip"]
+        board = ["s", "qu", "i", "e", "t", "x"]
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 2, board)
+        for edict in (ArrayEdict(words), ArrayEdict(words, minimize=True)):
+            assert solve_game.solve(edict) == ["quit", "quite"]
+            assert solve_game.solve(edict, stats=SolveStats()) == ["quit", "quite"]
+            assert sorted(solve_game.iter_words(edict)) == ["quit", "quite"]
+            assert list(solve_game.solve_paths(edict)["quite"]) == [1, 2, 4, 3]
+        assert "qu" in LETTERS and "q" not in LETTERS
+
 
 class test_SolveBoggle(unittest.TestCase):
 
@@ -170,6 +878,125 @@ class test_SolveBoggle(unittest.TestCase):
         assert solve_game.boggle.num_rows == rows
         assert solve_game.boggle.num_columns == columns
 
+    def test_searches_agree(self):
+        """Test the plain, instrumented and streaming searches find the same words."""
+        edict = Edict()
+        edict.read_dictionary(True)
+        for word in ["wat", "ate", "tea", "eat", "rate", "tater"]:
+            edict.add_word(word)
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        for min_word_len in (0, 3, 5):
+            solve_game.min_word_len = min_word_len
+            for adjacency_funct in (get_standard_boggle_adjacent, get_toroid_boggle_adjacent, get_scrabble_adjacent):
+                words = solve_game.solve(edict, adjacency_funct=adjacency_funct)
+                assert solve_game.solve(edict, adjacency_funct=adjacency_funct, stats=SolveStats()) == words
+                assert sorted(solve_game.iter_words(edict, adjacency_funct=adjacency_funct)) == words
+        assert "tater" in solve_game.solve(edict, adjacency_funct=get_scrabble_adjacent)
+        assert solve_game.solve(edict, [4], stats=SolveStats()) == solve_game.solve(edict, [4])
+
+    def test_parallel_solve(self):
+        """Test splitting the search between processes finds the same words."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        expected = solve_game.solve(edict, adjacency_funct=get_scrabble_adjacent)
+        assert solve_game.solve(edict, adjacency_funct=get_scrabble_adjacent, workers=2) == expected
+        assert solve_game.solve(edict, [4], workers=3) == solve_game.solve(edict, [4])
+
+    def test_iter_words(self):
+        """Test streaming words finds each word once, the same words as solve."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        for adjacency_funct in (get_standard_boggle_adjacent, get_scrabble_adjacent):
+            words = list(solve_game.iter_words(edict, adjacency_funct=adjacency_funct))
+            assert len(words) == len(set(words))
+            assert sorted(words) == solve_game.solve(edict, adjacency_funct=adjacency_funct)
+        assert sorted(solve_game.iter_words(edict, [4], prune=True)) == solve_game.solve(edict, [4])
+
+        first = next(solve_game.iter_words(edict))
+        assert first in solve_game.solve(edict)
+
+    def test_solve_paths(self):
+        """Test each path spells its word along adjacent indexes."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        boggle_array = solve_game.boggle.boggle_array
+        paths = solve_game.solve_paths(edict)
+        assert sorted(paths) == solve_game.solve(edict)
+        assert paths["wat"].typecode == 'B'
+        all_paths = solve_game.solve_paths(edict, all_paths=True)
+        assert sorted(all_paths) == sorted(paths)
+        for word, word_paths in all_paths.items():
+            assert paths[word] in word_paths
+            for path in word_paths:
+                assert ''.join(boggle_array[index] for index in path) == word
+                assert len(set(path)) == len(path)
+                for index, next_index in zip(path, path[1:]):
+                    assert next_index in get_standard_boggle_adjacent(index, 3, 3)
+        assert len(all_paths["eat"]) > 1
+        assert "wat" not in solve_game.solve_paths(edict, [0])
+
+    def test_path_typecode(self):
+        """Test paths use the smallest typecode the board fits in."""
+        assert path_typecode(16) == 'B'
+        assert path_typecode(256) == 'B'
+        assert path_typecode(257) == 'H'
+        assert path_typecode(100 * 100) == 'H'
+        assert path_typecode(1000 * 1000) == 'I'
+
+    def test_solve_stats(self):
+        """Test the instrumented search counts what it does and finds the same words."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        stats = SolveStats()
+        words = solve_game.solve(edict, stats=stats)
+        assert words == solve_game.solve(edict)
+        assert stats.trie_lookups == stats.nodes_visited + stats.dead_ends
+        assert stats.words_found >= len(words)
+        assert 3 <= stats.max_depth <= 5
+        assert set(stats.timings) == set(["neighbors", "search", "sort"])
+        assert "trie_lookups: %s" % stats.trie_lookups in str(stats)
+
+        parallel = SolveStats()
+        assert solve_game.solve(edict, stats=parallel, workers=2, prune=True) == words
+        assert "prune" in parallel.timings
+        assert parallel.words_found == stats.words_found
+        assert parallel.max_depth == stats.max_depth
+
+    def test_solve_many(self):
+        """Test solving a batch of boards gives the same words as solving each one."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water", "tree", "era"])
+        boards = ["waterater", "treeteeer", list("ratewater"), "tttaaaeee"]
+        solve_game = SolveBoggle()
+        expected = []
+        for board in boards:
+            solve_game.set_board(3, 3, board)
+            expected.append(solve_game.solve(edict))
+
+        stats = BatchStats()
+        assert list(solve_many(boards, edict, 3, 3, stats=stats)) == expected
+        assert stats.boards == len(boards)
+        assert stats.boards_per_second > 0
+        assert list(solve_many(boards, edict, 3, 3, workers=2, chunk_size=1)) == expected
+
+        batch_solver = BatchSolver(edict, 3, 3)
+        assert [batch_solver.solve(board) for board in boards] == expected
+
+    def test_solve_long_word(self):
+        """Test every search handles words longer than the recursion limit."""
+        length = sys.getrecursionlimit() + 100
+        array = ["a", "b"] * (length // 2)
+        solve_game = SolveBoggle()
+        solve_game.set_board(len(array), 1, array)
+        edict = ArrayEdict(["".join(array)])
+        assert solve_game.solve(edict) == ["".join(array)]
+        assert solve_game.solve(edict, stats=SolveStats()) == ["".join(array)]
+        assert list(solve_game.iter_words(edict)) == ["".join(array)]
+
 
 class test_Adjacency(unittest.TestCase):
 
@@ -271,5 +1098,106 @@ class test_Adjacency(unittest.TestCase):
             expected_adjacent.remove(index)
         assert 0 == len(expected_adjacent)
 
+    def test_neighbor_table(self):
+        """Test the neighbor table matches the adjacency functions."""
+        for adjacency_funct in (get_standard_boggle_adjacent, get_toroid_boggle_adjacent, get_scrabble_adjacent):
+            table = get_neighbor_table(adjacency_funct, 4, 5)
+            assert len(table) == 20
+            for index, adjacent in enumerate(table):
+                assert sorted(adjacent) == sorted(adjacency_funct(index, 4, 5, [index]))
+            assert get_neighbor_table(adjacency_funct, 4, 5) is table
+
+    def test_neighbor_table_small_toroid(self):
+        """Test the neighbor table has no repeats or self references when a toroid wraps onto itself."""
+        table = get_neighbor_table(get_toroid_boggle_adjacent, 3, 1)
+        assert table == ((2, 1), (0, 2), (1, 0))
+
+
+class test_topology(unittest.TestCase):
+
+    """Unit tests for topologies declared as data."""
+
+    def sorted_table(self, adjacency_funct, num_columns, num_rows):
+        return [sorted(adjacent) for adjacent in get_neighbor_table(adjacency_funct, num_columns, num_rows)]
+
+    def test_builtin_topologies(self):
+        """Test the standard and toroid topologies compile to the same tables as the adjacency functions."""
+        for num_columns, num_rows in ((4, 4), (5, 3), (1, 1), (2, 2), (1, 5)):
+            assert self.sorted_table(STANDARD, num_columns, num_rows) == \
+                self.sorted_table(get_standard_boggle_adjacent, num_columns, num_rows)
+            assert self.sorted_table(TOROID, num_columns, num_rows) == \
+                self.sorted_table(get_toroid_boggle_adjacent, num_columns, num_rows)
+
+    def test_shapes(self):
+        """Test hex, knight, cylinder and cube boards."""
+        hex_table = get_neighbor_table(HEX, 3, 3)
+        assert sorted(hex_table[4]) == [1, 2, 3, 5, 7, 8]
+        assert sorted(hex_table[0]) == [1, 3]
+        knight_table = get_neighbor_table(KNIGHT, 3, 3)
+        assert knight_table[4] == ()
+        assert sorted(knight_table[0]) == [5, 7]
+        cylinder_table = get_neighbor_table(CYLINDER, 3, 3)
+        assert sorted(cylinder_table[0]) == [1, 2, 3, 4, 5]
+        cube_table = get_neighbor_table(cube(3), 3, 9)
+        assert len(cube_table[13]) == 26
+        assert len(cube_table[0]) == 7
+        assert cube(3) is cube(3)
+        self.assertRaises(AssertionError, get_neighbor_table, cube(2), 3, 3)
+
+    def test_holes(self):
+        """Test holes have no neighbors and are no one's neighbor."""
+        holey = Topology(KING_MOVES, holes=[4])
+        table = get_neighbor_table(holey, 3, 3)
+        assert table[4] == ()
+        assert all(4 not in adjacent for adjacent in table)
+        assert list(holey(0, 3, 3, [1])) == [3]
+
+    def test_solve_holes(self):
+        """Test no word uses a hole, not even to start on, without passing it as an ignored index."""
+        holey = Topology(KING_MOVES, holes=[4])
+        edict = ArrayEdict(["a", "x", "ax", "tax", "wax", "wat"])
+        solve_game = SolveBoggle()
+        solve_game.min_word_len = 1
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "x", "a", "t", "e", "r"])
+        assert solve_game.solve(edict) == ["a", "ax", "tax", "wat", "wax", "x"]
+        assert solve_game.solve(edict, adjacency_funct=holey) == ["a", "wat"]
+        assert sorted(solve_game.iter_words(edict, adjacency_funct=holey)) == ["a", "wat"]
+        paths = solve_game.solve_paths(edict, adjacency_funct=holey, all_paths=True)
+        assert all(4 not in path for word_paths in paths.values() for path in word_paths)
+        incremental = IncrementalSolver(solve_game.boggle, edict, min_word_len=1, adjacency_funct=holey)
+        assert incremental.words == ["a", "wat"]
+        assert incremental.insert("a", 4) == (set(), set())
+        assert upper_bound(edict, ["w", "a", "t", "e", "x", "a", "t", "e", "r"], 3, 3, adjacency_funct=holey,
+                           min_word_len=1) == BOGGLE_SCORER.score(["a", "wat"])
+
+    def test_key(self):
+        """Test topologies are keyed by what they are, not by their names."""
+        knight = Topology(KNIGHT_MOVES, name="knight")
+        assert knight == KNIGHT and hash(knight) == hash(KNIGHT)
+        assert get_neighbor_table(knight, 3, 3) == get_neighbor_table(KNIGHT, 3, 3)
+        assert SolutionCache.make_key(3, 3, "waterater", 3, knight) == \
+            SolutionCache.make_key(3, 3, "waterater", 3, KNIGHT)
+
+        impostor = Topology(KING_MOVES, name="knight")
+        assert impostor != KNIGHT
+        assert get_neighbor_table(impostor, 3, 3) != get_neighbor_table(KNIGHT, 3, 3)
+        assert SolutionCache.make_key(3, 3, "waterater", 3, impostor) != \
+            SolutionCache.make_key(3, 3, "waterater", 3, KNIGHT)
+        assert adjacency_key(Topology(KING_MOVES, holes=[4], name="standard")) != adjacency_key(STANDARD)
+        assert repr(impostor) == "knight"
+
+    def test_solve(self):
+        """Test solving with a topology finds what the matching adjacency function does."""
+        edict = ArrayEdict(["wat", "ate", "tea", "eat", "rate", "tater", "water", "rat", "tar"])
+        solve_game = SolveBoggle()
+        solve_game.set_board(3, 3, ["w", "a", "t", "e", "r", "a", "t", "e", "r"])
+        assert solve_game.solve(edict, adjacency_funct=STANDARD) == solve_game.solve(edict)
+        assert solve_game.solve(edict, adjacency_funct=TOROID) == \
+            solve_game.solve(edict, adjacency_funct=get_toroid_boggle_adjacent)
+        assert solve_game.solve(edict, adjacency_funct=KNIGHT) == ["rat", "tar", "wat"]
+        assert SolutionCache.make_key(3, 3, "waterater", 3, HEX) != SolutionCache.make_key(3, 3, "waterater", 3, KNIGHT)
+        assert Topology(KING_MOVES).__name__ != Topology(KING_MOVES, holes=[4]).__name__
+
+
 if __name__ == '__main__':
     unittest.main()
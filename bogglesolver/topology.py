@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""Board topologies declared as data.
+
+A Topology is the moves a path can make from a cell, as steps along each axis,
+with which axes wrap around and which cells are holes.
+It is compiled into the same neighbor table as the adjacency functions,
+so the search is just as fast whatever the topology.
+
+A Topology can be used anywhere an adjacency function can:
+
+    solver.solve(edict, adjacency_funct=HEX)
+
+Boards are still indexed row by row. A board with depth layers is
+num_columns wide and num_rows tall, with the layers stacked one after another down the rows.
+"""
+
+
+from functools import lru_cache
+from itertools import product
+
+
+# the eight cells around a cell, like standard boggle.
+KING_MOVES = tuple((x, y) for x, y in product((-1, 0, 1), repeat=2) if (x, y) != (0, 0))
+
+KNIGHT_MOVES = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+
+# hexagons, with every odd row shifted half a cell to the right.
+HEX_EVEN_ROW_MOVES = ((-1, 0), (1, 0), (-1, -1), (0, -1), (-1, 1), (0, 1))
+HEX_ODD_ROW_MOVES = ((-1, 0), (1, 0), (0, -1), (1, -1), (0, 1), (1, 1))
+
+# the twenty six cells around a cell in a cube.
+CUBE_MOVES = tuple(move for move in product((-1, 0, 1), repeat=3) if move != (0, 0, 0))
+
+
+class Topology:
+
+    """
+    How the cells of a board are connected.
+
+    :param moves: steps a path can take, each a tuple of (columns, rows) or (columns, rows, layers).
+    :param odd_row_moves: steps from cells on odd rows, if they are different (optional).
+    :param wrap: for each axis, True if stepping off one edge comes back on the other (optional).
+    :param int depth: number of layers.
+    :param holes: indexes of cells that aren't on the board (optional).
+        A hole has no neighbors, isn't a neighbor of any cell, and no word starts on one.
+    :param name: name for the topology, only used to show it (optional).
+    :type name: str or None
+
+    Topologies with the same moves, wrap, depth and holes are equal whatever their names,
+        and share one key, used for neighbor table and solution cache keys.
+    """
+
+    def __init__(self, moves, odd_row_moves=None, wrap=(), depth=1, holes=(), name=None):
+        self.moves = tuple(tuple(move) for move in moves)
+        self.odd_row_moves = self.moves if odd_row_moves is None else tuple(tuple(move) for move in odd_row_moves)
+        self.wrap = tuple(wrap) + (False,) * (3 - len(wrap))
+        self.depth = depth
+        self.holes = frozenset(holes)
+        # a name can be reused for another topology, so the key is made from what the topology is.
+        self.key = "Topology(%r, %r, %r, %r, %r)" % (self.moves, self.odd_row_moves, self.wrap, self.depth,
+                                                     sorted(self.holes))
+        self.__name__ = self.key if name is None else name
+
+    def __repr__(self):
+        return self.__name__
+
+    def __eq__(self, other):
+        if not isinstance(other, Topology):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __call__(self, index, num_columns, num_rows, ignore=None):
+        """
+        Get all adjacent indexes, like an adjacency function.
+
+        :param int index: index to get all adjacent indexes of.
+        :param int num_columns: number of columns in the board.
+        :param int num_rows: number of rows in the board, for every layer.
+        :param list ignore: optional list of indexes to ignore.
+        :yields: the adjacent indices.
+        """
+        if ignore is None:
+            ignore = []
+        for neighbor in self._neighbors(index, num_columns, num_rows):
+            if neighbor not in ignore:
+                yield neighbor
+
+    def _neighbors(self, index, num_columns, num_rows):
+        if index in self.holes:
+            return
+        layer_rows = num_rows // self.depth
+        assert layer_rows * self.depth == num_rows, "%s rows can't be split into %s layers." % (num_rows, self.depth)
+        sizes = (num_columns, layer_rows, self.depth)
+        column = index % num_columns
+        row = index // num_columns % layer_rows
+        layer = index // (num_columns * layer_rows)
+        for move in self.odd_row_moves if row % 2 else self.moves:
+            position = [column, row, layer]
+            for axis, step in enumerate(move):
+                value = position[axis] + step
+                if not 0 <= value < sizes[axis]:
+                    if not self.wrap[axis]:
+                        break
+                    value %= sizes[axis]
+                position[axis] = value
+            else:
+                neighbor = (position[2] * layer_rows + position[1]) * num_columns + position[0]
+                if neighbor != index and neighbor not in self.holes:
+                    yield neighbor
+
+    def neighbor_table(self, num_columns, num_rows):
+        """
+        Compile the topology for a board size.
+
+        :param int num_columns: number of columns in the board.
+        :param int num_rows: number of rows in the board, for every layer.
+        :returns: tuple where item i is a tuple of the indexes adjacent to index i, like get_neighbor_table.
+        """
+        table = []
+        for index in range(num_columns * num_rows):
+            adjacent = []
+            # small boards can wrap back onto the same index more than once.
+            for neighbor in self._neighbors(index, num_columns, num_rows):
+                if neighbor not in adjacent:
+                    adjacent.append(neighbor)
+            table.append(tuple(adjacent))
+        return tuple(table)
+
+
+STANDARD = Topology(KING_MOVES, name="standard")
+TOROID = Topology(KING_MOVES, wrap=(True, True), name="toroid")
+# wraps left to right only.
+CYLINDER = Topology(KING_MOVES, wrap=(True, False), name="cylinder")
+HEX = Topology(HEX_EVEN_ROW_MOVES, HEX_ODD_ROW_MOVES, name="hex")
+KNIGHT = Topology(KNIGHT_MOVES, name="knight")
+
+
+@lru_cache(maxsize=None)
+def cube(depth):
+    """
+    Get the topology of a board with layers stacked on top of each other, each cell touching the 26 around it.
+
+    :param int depth: number of layers.
+    :returns: Topology, the same one for every call with the same depth.
+    """
+    return Topology(CUBE_MOVES, depth=depth, name="cube%s" % depth)
@@ -27,7 +27,8 @@ setuptools.setup(
 
     packages=setuptools.find_packages(),
 
-    entry_points={'console_scripts': ['bogglesolver = bogglesolver.cli:main']},
+    entry_points={'console_scripts': ['bogglesolver = bogglesolver.cli:main',
+                                      'bogglesolver-compile = bogglesolver.compiled_dictionary:main']},
 
     long_description=(README + '\n' + CHANGES),
     license='LGPL',
@@ -35,8 +36,17 @@ setuptools.setup(
         'Development Status :: 1 - Planning',
         'Natural Language :: English',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
 
+    # solve_many cancels the boards it hasn't solved with Executor.shutdown(cancel_futures=True) (3.9),
+    # and boards are generated with random.choices (3.6).
+    python_requires='>=3.9',
+
     install_requires=[],
 )